@@ -1,11 +1,23 @@
-from flask import Flask, render_template, session
+from flask import Flask
 from routes.screen import screen_bp
 from routes.follow_up import follow_up_bp
+from routes.docs import docs_bp, warm_doc_cache
 from flask_cors import CORS
 from flask_session import Session
-import markdown
+from cachelib.file import FileSystemCache
+import logging
 import os
 import redis
+import threading
+import time
+
+# Configure logging once; handlers (e.g. JSON output) can be swapped later
+# without touching call sites
+logging.basicConfig(
+    level=os.environ.get('LOG_LEVEL', 'INFO'),
+    format='%(asctime)s %(levelname)s %(name)s %(message)s'
+)
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 CORS(app)
@@ -24,20 +36,47 @@ redis_password = os.environ.get('REDIS_PASSWORD', None)
 redis_db = int(os.environ.get('REDIS_DB', 0))
 
 try:
-    redis_client = redis.Redis(
+    # Share one connection pool across the app so concurrent requests don't
+    # serialize on a single socket or churn TCP connections
+    # Timeouts are aggressive so a flapping Redis fails requests fast
+    # instead of stalling worker threads indefinitely
+    redis_pool = redis.ConnectionPool(
         host=redis_host,
         port=redis_port,
         password=redis_password,
-        db=redis_db
+        db=redis_db,
+        max_connections=64,
+        socket_keepalive=True,
+        socket_connect_timeout=1.0,
+        socket_timeout=1.0,
+        retry_on_timeout=False,
+        health_check_interval=30
     )
-    redis_client.ping()  # Test connection
-    print(f"[INFO] Connected to Redis at {redis_host}:{redis_port}")
+    redis_client = redis.Redis(connection_pool=redis_pool)
+    # Boot-time reachability check with a more forgiving timeout, so a
+    # slow-but-alive Redis at startup still counts as connected
+    redis.Redis(
+        host=redis_host,
+        port=redis_port,
+        password=redis_password,
+        db=redis_db,
+        socket_connect_timeout=2.0,
+        socket_timeout=2.0
+    ).ping()
+    logger.info("Connected to Redis at %s:%s", redis_host, redis_port)
     app.config['SESSION_REDIS'] = redis_client
+    app.config['REDIS_POOL'] = redis_pool
 except Exception as e:
-    print(f"[WARNING] Redis connection failed: {e}. Using filesystem session.")
-    app.config['SESSION_TYPE'] = 'filesystem'
-    app.config['SESSION_FILE_DIR'] = '/tmp/pukaar_sessions'
-    os.makedirs(app.config['SESSION_FILE_DIR'], exist_ok=True)
+    logger.warning("Redis connection failed: %s. Using disk-backed session cache.", e)
+    # cachelib's FileSystemCache prunes itself at `threshold` entries, which
+    # avoids the unbounded one-file-per-session churn of the old
+    # 'filesystem' backend under load
+    app.config['SESSION_TYPE'] = 'cachelib'
+    app.config['SESSION_CACHELIB'] = FileSystemCache(
+        cache_dir='/tmp/pukaar_sessions',
+        threshold=2000,
+        default_timeout=86400
+    )
 
 # Initialize Flask-Session
 Session(app)
@@ -45,80 +84,47 @@ Session(app)
 # Register blueprints
 app.register_blueprint(screen_bp)
 app.register_blueprint(follow_up_bp)
+app.register_blueprint(docs_bp)
 
-# Serve API documentation from markdown file
-@app.route('/api-doc')
-def api_documentation():
-    try:
-        # Read the markdown file - try multiple possible paths
-        possible_paths = [
-            os.path.join(os.path.dirname(__file__), '..', 'API_DOCUMENTATION.md'),  # Relative to backend folder
-            os.path.join(os.getcwd(), 'API_DOCUMENTATION.md'),  # Current working directory
-            '/app/API_DOCUMENTATION.md',  # Docker container path
-            'API_DOCUMENTATION.md'  # Direct path
-        ]
-        
-        md_content = None
-        used_path = None
-        
-        for path in possible_paths:
-            try:
-                with open(path, 'r', encoding='utf-8') as file:
-                    md_content = file.read()
-                    used_path = path
-                    break
-            except FileNotFoundError:
-                continue
-        
-        if md_content is None:
-            # If file not found, return error with all attempted paths
-            error_paths = '\n'.join([f"- {path}" for path in possible_paths])
-            return f'''
-            <!DOCTYPE html>
-            <html>
-            <head><title>Documentation Not Found</title></head>
-            <body>
-                <h1>Documentation Not Found</h1>
-                <p>The API_DOCUMENTATION.md file was not found. Tried these paths:</p>
-                <pre>{error_paths}</pre>
-                <p>Current working directory: {os.getcwd()}</p>
-                <p>Files in current directory: {os.listdir('.')}</p>
-            </body>
-            </html>
-            ''', 404
-        
-        # Convert markdown to HTML
-        html_content = markdown.markdown(md_content, extensions=['fenced_code', 'tables', 'codehilite'])
-        
-        # Render the template with the converted content
-        return render_template('api_doc_template.html', content=html_content)
-        
-    except Exception as e:
-        return f'''
-        <!DOCTYPE html>
-        <html>
-        <head><title>Error</title></head>
-        <body>
-            <h1>Error Loading Documentation</h1>
-            <p>Error: {str(e)}</p>
-            <p>Current working directory: {os.getcwd()}</p>
-            <p>Files in current directory: {os.listdir('.')}</p>
-        </body>
-        </html>
-        ''', 500
+# Render the API documentation during boot so the first request is served
+# from the hot cache instead of paying the full markdown + Pygments cost
+warm_doc_cache(app)
+
+# Liveness/readiness probes hit /api/health every few seconds; cache the
+# result briefly so steady-state probe traffic doesn't PING Redis each time
+_HEALTH_CACHE_TTL = 0.5  # seconds
+_HEALTH_CACHE = {'ts': 0.0, 'value': None}
+_HEALTH_LOCK = threading.Lock()
 
 @app.route('/api/health')
 def health_check():
     """Health check endpoint"""
+    with _HEALTH_LOCK:
+        if time.monotonic() - _HEALTH_CACHE['ts'] < _HEALTH_CACHE_TTL:
+            return _HEALTH_CACHE['value']
+
     try:
         # Check Redis connection
         redis_status = "Connected" if app.config['SESSION_TYPE'] == 'redis' and app.config['SESSION_REDIS'].ping() else "Not connected"
-        
-        return {
+
+        result = {
             "status": "healthy",
             "redis": redis_status,
             "session_type": app.config['SESSION_TYPE']
         }
+
+        # Report pool usage so connection leaks are visible from the probe
+        pool = app.config.get('REDIS_POOL')
+        if pool is not None:
+            result["redis_pool"] = {
+                "created_connections": pool.created_connections,
+                "in_use_connections": len(pool._in_use_connections)
+            }
+
+        with _HEALTH_LOCK:
+            _HEALTH_CACHE.update({'ts': time.monotonic(), 'value': result})
+
+        return result
     except Exception as e:
         return {
             "status": "unhealthy",
@@ -126,5 +132,13 @@ def health_check():
         }, 500
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    # Debug mode (and its stat-heavy reloader) only when explicitly requested;
+    # production should run through wsgi.py under gunicorn/uwsgi instead
+    app.run(
+        host="0.0.0.0",
+        port=5000,
+        debug=os.environ.get('FLASK_DEBUG') == '1',
+        threaded=True,
+        use_reloader=False
+    )
 
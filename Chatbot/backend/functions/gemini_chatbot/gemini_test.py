@@ -1,10 +1,26 @@
 from vertexai.generative_models import GenerativeModel
 import vertexai
+import asyncio
+import os
 
-vertexai.init(project="pkr-prod-in-core", location="asia-south1-a ")
+# Initialize once at module load; re-running init per call pays credential
+# discovery and channel setup every time. Project/location come from the
+# environment so one module serves every deployment
+vertexai.init(
+    project=os.environ.get("GCP_PROJECT", "pkr-prod-in-core"),
+    location=os.environ.get("GCP_LOCATION", "asia-south1")
+)
 
-model = GenerativeModel("gemini-2.0-flash-001")  # Or another name you found
+# Construct the model once and reuse it across calls
+model = GenerativeModel(os.environ.get("GEMINI_MODEL", "gemini-2.0-flash-001"))
 
-response = model.generate_content("Explain the concept of gravity.")
-print(response.text)
+async def generate(prompts):
+    """Run all prompts concurrently so the RPC latencies overlap."""
+    responses = await asyncio.gather(
+        *(model.generate_content_async(prompt) for prompt in prompts)
+    )
+    return [response.text for response in responses]
 
+if __name__ == "__main__":
+    for text in asyncio.run(generate(["Explain the concept of gravity."])):
+        print(text)
@@ -4,13 +4,29 @@ Coordinates the flow between different Gemini services based on session state
 """
 
 import asyncio
+import hashlib
 import time
 import logging
 from typing import Dict, Any, Optional, List, Union, Tuple
 from concurrent.futures import ThreadPoolExecutor
 
-from .session_manager import SessionManager, FLOW_TYPES
+import numpy as np
+import orjson
+import redis.asyncio as aioredis
+
+from .session_manager import (
+    SessionManager, FLOW_TYPES,
+    REDIS_HOST, REDIS_PORT, REDIS_PASSWORD, REDIS_DB
+)
 from .screening_flow import ScreeningFlow, ScreeningState
+
+# FLOW_TYPES values bound once at import; the handlers reference these on
+# every message, and a module global skips the dict lookup + string hash
+_FT_INITIAL = FLOW_TYPES['INITIAL']
+_FT_TRIAGE = FLOW_TYPES['TRIAGE']
+_FT_SCREENING = FLOW_TYPES['SCREENING']
+_FT_RED_FLAG = FLOW_TYPES['RED_FLAG']
+_FT_FOLLOW_UP = FLOW_TYPES['FOLLOW_UP']
 from models.gemini_clients import (
     ContextClassifierClient, 
     TriageClient, 
@@ -23,6 +39,84 @@ from models.gemini_clients import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# One pool shared by every orchestrator call; spawning a fresh
+# ThreadPoolExecutor per request paid thread start/join on each Gemini call
+_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="orch")
+
+# Expiry for cached LLM results (red flag / classification / advice)
+LLM_CACHE_TTL = 3600  # 1 hour
+
+# How many trailing history messages the follow-up prompt includes
+_HISTORY_TAIL = 5
+
+# Conditions scored by triage, with a reusable buffer for picking the top
+# one without building a dict per turn. The fill + argmax runs without an
+# await in between, so coroutines never see each other's values
+_TRIAGE_KEYS = ("Pneumonia / ARI", "Diarrhea", "Malnutrition", "Neonatal Sepsis", "Neonatal Jaundice")
+_TRIAGE_SCRATCH = np.empty(len(_TRIAGE_KEYS), dtype=np.float32)
+
+def _as_dict(value: Any) -> Dict[str, Any]:
+    """Normalize a possibly-missing/possibly-wrong-typed value to a dict"""
+    return value if isinstance(value, dict) else {}
+
+class _SessionView:
+    """Per-request view of a session: one read up front, one write at the end.
+
+    Handlers used to call SessionManager three-plus times per message, each a
+    Redis round-trip plus a JSON decode. The view loads the session once,
+    handlers mutate the dict and mark the touched keys dirty, and flush()
+    writes the dirty keys back in a single update.
+    """
+
+    __slots__ = ('session_id', 'data', 'dirty')
+
+    def __init__(self, session_id: str, data: Dict[str, Any]):
+        self.session_id = session_id
+        self.data = data
+        self.dirty: set = set()
+
+    @classmethod
+    async def load(cls, session_id: str) -> '_SessionView':
+        data = _as_dict(await asyncio.to_thread(SessionManager.get_session, session_id))
+        return cls(session_id, data)
+
+    def set(self, key: str, value: Any) -> None:
+        self.data[key] = value
+        self.dirty.add(key)
+
+    def set_flow_type(self, flow_type: str) -> None:
+        self.set('flow_type', flow_type)
+        self.set('current_step', 0)
+
+    def advance_step(self) -> int:
+        new_step = self.data.get('current_step', 0) + 1
+        self.set('current_step', new_step)
+        return new_step
+
+    def add_red_flag(self, red_flag_data: Dict[str, Any]) -> None:
+        self.data.setdefault('red_flags', []).append(red_flag_data)
+        self.dirty.add('red_flags')
+
+    def set_screening_data(self, condition: str, data: Dict[str, Any]) -> None:
+        self.data.setdefault('screening_data', {})[condition] = data
+        self.dirty.add('screening_data')
+
+    def _commit(self, system_message: Optional[str]) -> None:
+        pipe = SessionManager.pipeline()
+        if self.dirty:
+            updates = {key: self.data[key] for key in self.dirty}
+            SessionManager.update_session(self.session_id, updates, pipe=pipe)
+        if system_message is not None:
+            SessionManager.add_message_to_history(self.session_id, "system", system_message, pipe=pipe)
+        if pipe is not None:
+            pipe.execute()
+
+    async def flush(self, system_message: Optional[str] = None) -> None:
+        """Write the dirty keys (and optional system reply) in one round trip"""
+        if self.dirty or system_message is not None:
+            await asyncio.to_thread(self._commit, system_message)
+            self.dirty.clear()
+
 class Orchestrator:
     """Orchestrates the flow between different Gemini services"""
     
@@ -33,102 +127,163 @@ class Orchestrator:
         self.red_flag_client = RedFlagClient()
         self.screening_client = ScreeningClient()
         self.advice_client = AdviceClient()
+        self._executor = _EXECUTOR
+        # Redis-backed cache for LLM results so repeated inputs (common in
+        # chat: "ok", "yes", "what should I do?") skip the Gemini round-trip
+        self._cache = aioredis.Redis(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            password=REDIS_PASSWORD,
+            db=REDIS_DB,
+            socket_connect_timeout=1.0,
+            socket_timeout=1.0
+        )
+        # O(1) flow dispatch instead of re-comparing FLOW_TYPES values on
+        # every message; unknown flow types fall back to the initial flow
+        self._flow_dispatch = {
+            _FT_TRIAGE: self._handle_triage_flow,
+            _FT_SCREENING: self._handle_screening_flow,
+            _FT_RED_FLAG: self._handle_red_flag_flow,
+            _FT_FOLLOW_UP: self._handle_follow_up_flow,
+            _FT_INITIAL: self._handle_initial_flow
+        }
+
+    @staticmethod
+    def _cache_key(prefix: str, *parts: str) -> str:
+        digest = hashlib.blake2b("\x00".join(parts).encode(), digest_size=16).hexdigest()
+        return f"{prefix}:{digest}"
+
+    async def _cached_call(self, key: str, call) -> Dict[str, Any]:
+        """Return the cached result for key, or run call() and cache it"""
+        try:
+            cached = await self._cache.get(key)
+            if cached is not None:
+                return orjson.loads(cached)
+        except Exception as e:
+            logger.warning("LLM cache read failed: %s", e)
+        
+        result = await call()
+        
+        if isinstance(result, dict) and result.get("success"):
+            try:
+                await self._cache.set(key, orjson.dumps(result), ex=LLM_CACHE_TTL)
+            except Exception as e:
+                logger.warning("LLM cache write failed: %s", e)
+        
+        return result
+
+    async def aclose(self):
+        """Release the shared executor on app shutdown"""
+        self._executor.shutdown(wait=False)
         
-    async def process_message(self, user_input: str = '', session_id: str = '', metadata: Dict = {}) -> Dict[str, Any]:
+    async def process_message(self, user_input: str = '', session_id: str = '', metadata: Optional[Dict] = None) -> Dict[str, Any]:
         """Process a user message through the appropriate flow"""
-        user_input = user_input or ''
-        session_id = session_id or ''
-        metadata = metadata or {}
+        if metadata is None:
+            metadata = {}
         start_time = time.time()
         
+        # Session calls block on Redis, so keep them off the event loop
         # Create session if it doesn't exist
         if not session_id:
-            session_id = SessionManager.create_session()
-            logger.info(f"Created new session: {session_id}")
+            session_id = await asyncio.to_thread(SessionManager.create_session)
+            logger.info("Created new session: %s", session_id)
         
-        # Get current session state
-        session_data = SessionManager.get_session(session_id) or {}
-        if not session_data:
-            session_id = SessionManager.create_session()
-            session_data = SessionManager.get_session(session_id) or {}
-            logger.info(f"Created new session after failed retrieval: {session_id}")
+        # Load the session once; handlers work against this view and the
+        # dirty keys are written back in a single update after dispatch
+        view = await _SessionView.load(session_id)
+        if not view.data:
+            session_id = await asyncio.to_thread(SessionManager.create_session)
+            view = await _SessionView.load(session_id)
+            logger.info("Created new session after failed retrieval: %s", session_id)
         
-        # Add user message to conversation history
-        SessionManager.add_message_to_history(session_id, "user", user_input)
+        # Add user message to conversation history (mirrored into the view so
+        # handlers see the message they are responding to)
+        await asyncio.to_thread(SessionManager.add_message_to_history, session_id, "user", user_input)
+        view.data.setdefault('conversation_history', []).append(
+            {'role': 'user', 'content': user_input, 'timestamp': time.time()}
+        )
         
-        # Get current state and flow type
-        current_state = ScreeningFlow.get_current_state(session_id)
-        flow_type = session_data.get('flow_type', FLOW_TYPES['INITIAL']) if isinstance(session_data, dict) else FLOW_TYPES['INITIAL']
+        # Get current state and flow type from the data already in hand
+        current_state = ScreeningFlow.get_current_state(session_id, view.data)
+        flow_type = view.data.get('flow_type', _FT_INITIAL)
         
-        # Run red flag detection in parallel with other processing
-        red_flag_future = asyncio.create_task(self._check_red_flags(user_input))
+        # Run red flag detection and the flow handler truly in parallel so
+        # their Gemini round-trips overlap end-to-end
+        red_flag_result, result = await asyncio.gather(
+            self._check_red_flags(user_input),
+            self._dispatch_flow(flow_type, user_input, view, metadata),
+            return_exceptions=True
+        )
         
-        # Process based on current flow type
-        result = {}
-        
-        if flow_type == FLOW_TYPES['INITIAL']:
-            # For initial messages, classify context first
-            result = await self._handle_initial_flow(user_input, session_id)
-        elif flow_type == FLOW_TYPES['TRIAGE']:
-            # For triage flow, perform triage analysis
-            result = await self._handle_triage_flow(user_input, session_id)
-        elif flow_type == FLOW_TYPES['SCREENING']:
-            # For screening flow, handle screening steps
-            result = await self._handle_screening_flow(user_input, session_id, metadata)
-        elif flow_type == FLOW_TYPES['RED_FLAG']:
-            # For red flag flow, provide emergency guidance
-            result = await self._handle_red_flag_flow(user_input, session_id)
-        elif flow_type == FLOW_TYPES['FOLLOW_UP']:
-            # For follow-up flow, handle follow-up questions
-            result = await self._handle_follow_up_flow(user_input, session_id)
-        else:
-            # Default to initial flow for unknown flow types
-            result = await self._handle_initial_flow(user_input, session_id)
+        if isinstance(result, BaseException):
+            logger.error("Error in flow dispatch: %s", result)
+            result = {
+                "error": True,
+                "error_message": str(result),
+                "response": "I'm having trouble processing your request. Please try again."
+            }
         
-        # Check red flag results
-        red_flag_result = await red_flag_future or {}
+        if isinstance(red_flag_result, BaseException):
+            logger.error("Error in red flag detection: %s", red_flag_result)
+            red_flag_result = {}
+        red_flag_result = red_flag_result or {}
         if red_flag_result.get("red_flag_result", {}).get("red_flag_detected", False):
             # Override with red flag flow if detected
-            result = await self._handle_red_flag_detected(red_flag_result, session_id)
+            result = await self._handle_red_flag_detected(red_flag_result, view)
         
-        # Add system response to conversation history
-        if isinstance(result, dict) and "response" in result:
-            SessionManager.add_message_to_history(session_id, "system", result["response"])
+        # One pipelined write for everything the handlers changed plus the
+        # system response appended to the conversation history
+        system_message = result.get("response") if isinstance(result, dict) else None
+        await view.flush(system_message)
         
-        # Add session info to result
-        session_data = SessionManager.get_session(session_id) or {}
+        # Add session info from the view - no final re-read needed
         result.update({
             "session_id": session_id,
-            "flow_type": session_data.get('flow_type', FLOW_TYPES['INITIAL']) if isinstance(session_data, dict) else FLOW_TYPES['INITIAL'],
-            "current_step": session_data.get('current_step', 0) if isinstance(session_data, dict) else 0,
+            "flow_type": view.data.get('flow_type', _FT_INITIAL),
+            "current_step": view.data.get('current_step', 0),
             "processing_time": time.time() - start_time
         })
         
         return result
     
+    async def _dispatch_flow(self, flow_type: str, user_input: str, view: _SessionView, metadata: Dict) -> Dict[str, Any]:
+        """Route a message to the handler for the session's flow type"""
+        handler = self._flow_dispatch.get(flow_type, self._handle_initial_flow)
+        return await handler(user_input, view, metadata)
+    
     async def _check_red_flags(self, user_input: str) -> Dict[str, Any]:
         """Check for red flags in user input"""
         try:
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                return await loop.run_in_executor(
-                    executor,
-                    lambda: self.red_flag_client.detect_red_flags(user_input)
-                )
+            key = self._cache_key("rf", user_input)
+            return await self._cached_call(
+                key,
+                lambda: self.red_flag_client.detect_red_flags_async(user_input)
+            )
         except Exception as e:
-            logger.error(f"Error in red flag detection: {e}")
+            logger.error("Error in red flag detection: %s", e)
             return {"error": True, "error_message": str(e)}
     
-    async def _handle_initial_flow(self, user_input: str, session_id: str) -> Dict[str, Any]:
+    async def _handle_initial_flow(self, user_input: str, view: _SessionView, metadata: Optional[Dict] = None) -> Dict[str, Any]:
         """Handle the initial flow with context classification"""
         try:
-            # Classify the context
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                classification_result = await loop.run_in_executor(
-                    executor,
-                    lambda: self.context_client.classify(user_input)
-                )
+            # Classification decides the branch, but the non-screenable
+            # branch then needs general advice - a second sequential Gemini
+            # round-trip. Issue both calls concurrently and discard the
+            # speculative advice when classification picks another branch,
+            # so that path costs one RTT instead of two
+            classification_result, general_advice_result = await asyncio.gather(
+                self._cached_call(
+                    self._cache_key("ctx", user_input),
+                    lambda: self.context_client.classify_async(user_input)
+                ),
+                self._cached_call(
+                    self._cache_key("adv", "general", user_input),
+                    lambda: self.advice_client.get_advice_async("general", user_input)
+                ),
+                return_exceptions=True
+            )
+            if isinstance(classification_result, BaseException):
+                raise classification_result
             
             if not classification_result.get("success", False):
                 return {
@@ -141,25 +296,21 @@ class Orchestrator:
             classified_context = classification.get("classified_context", "medical_screenable")
             
             # Update session with classification result
-            SessionManager.update_session(session_id, {
-                "context_classification": classification
-            })
+            view.set("context_classification", classification)
             
             # Determine next flow based on classification
             if classified_context == "medical_screenable":
                 # Transition to triage flow
-                SessionManager.set_flow_type(session_id, FLOW_TYPES['TRIAGE'])
+                view.set_flow_type(_FT_TRIAGE)
                 
                 # Perform triage
-                triage_result = await self._handle_triage_flow(user_input, session_id)
+                triage_result = await self._handle_triage_flow(user_input, view)
                 return triage_result
             
             elif classified_context == "medical_non_screenable":
-                # For non-screenable medical concerns, provide advice
-                advice_result = await loop.run_in_executor(
-                    executor,
-                    lambda: self.advice_client.get_advice("general", user_input)
-                )
+                # For non-screenable medical concerns, use the advice that
+                # was fetched speculatively alongside classification
+                advice_result = {} if isinstance(general_advice_result, BaseException) else general_advice_result
                 
                 if not advice_result.get("success", False):
                     return {
@@ -180,9 +331,9 @@ class Orchestrator:
             
             else:  # non_medical
                 # For non-medical concerns, provide general guidance
-                advice_result = await loop.run_in_executor(
-                    executor,
-                    lambda: self.advice_client.get_advice("parenting", user_input)
+                advice_result = await self._cached_call(
+                    self._cache_key("adv", "parenting", user_input),
+                    lambda: self.advice_client.get_advice_async("parenting", user_input)
                 )
                 
                 if not advice_result.get("success", False):
@@ -203,23 +354,18 @@ class Orchestrator:
                 }
             
         except Exception as e:
-            logger.error(f"Error in initial flow: {e}")
+            logger.error("Error in initial flow: %s", e)
             return {
                 "error": True,
                 "error_message": str(e),
                 "response": "I'm having trouble processing your request. Please try again."
             }
     
-    async def _handle_triage_flow(self, user_input: str, session_id: str) -> Dict[str, Any]:
+    async def _handle_triage_flow(self, user_input: str, view: _SessionView, metadata: Optional[Dict] = None) -> Dict[str, Any]:
         """Handle the triage flow"""
         try:
             # Perform triage analysis
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                triage_result = await loop.run_in_executor(
-                    executor,
-                    lambda: self.triage_client.triage(user_input)
-                )
+            triage_result = await self.triage_client.triage_async(user_input)
             
             if not triage_result.get("success", False):
                 return {
@@ -230,35 +376,25 @@ class Orchestrator:
             
             # Update session with triage result
             triage_data = triage_result.get("triage_result", {})
-            SessionManager.update_session(session_id, {
-                "triage_result": triage_data
-            })
+            view.set("triage_result", triage_data)
             
             # Check if screenable
             screenable = triage_data.get("screenable", True)
             
             if screenable:
                 # Transition to screening flow if screenable
-                SessionManager.set_flow_type(session_id, FLOW_TYPES['SCREENING'])
+                view.set_flow_type(_FT_SCREENING)
                 
                 # Determine the condition with highest score
-                conditions = {
-                    "Pneumonia / ARI": triage_data.get("Pneumonia / ARI", 0),
-                    "Diarrhea": triage_data.get("Diarrhea", 0),
-                    "Malnutrition": triage_data.get("Malnutrition", 0),
-                    "Neonatal Sepsis": triage_data.get("Neonatal Sepsis", 0),
-                    "Neonatal Jaundice": triage_data.get("Neonatal Jaundice", 0)
-                }
-                
-                highest_condition = max(conditions.items(), key=lambda x: x[1])
-                condition_name = highest_condition[0]
-                condition_score = highest_condition[1]
+                for i, key in enumerate(_TRIAGE_KEYS):
+                    _TRIAGE_SCRATCH[i] = triage_data.get(key, 0)
+                idx = int(_TRIAGE_SCRATCH.argmax())
+                condition_name = _TRIAGE_KEYS[idx]
+                condition_score = float(_TRIAGE_SCRATCH[idx])
                 
                 # Store selected condition in session
-                SessionManager.update_session(session_id, {
-                    "selected_condition": condition_name,
-                    "condition_score": condition_score
-                })
+                view.set("selected_condition", condition_name)
+                view.set("condition_score", condition_score)
                 
                 response = triage_data.get("response", "Based on your description, I'd like to ask a few more questions to better understand the situation.")
                 
@@ -283,25 +419,23 @@ class Orchestrator:
                 }
             
         except Exception as e:
-            logger.error(f"Error in triage flow: {e}")
+            logger.error("Error in triage flow: %s", e)
             return {
                 "error": True,
                 "error_message": str(e),
                 "response": "I'm having trouble analyzing your concern. Please try again with more details about the symptoms."
             }
     
-    async def _handle_screening_flow(self, user_input: str = '', session_id: str = '', metadata: Dict = {}) -> Dict[str, Any]:
+    async def _handle_screening_flow(self, user_input: str, view: _SessionView, metadata: Optional[Dict] = None) -> Dict[str, Any]:
         """Handle the screening flow based on the current step"""
-        user_input = user_input or ''
-        session_id = session_id or ''
-        metadata = metadata or {}
         try:
-            session_data = SessionManager.get_session(session_id) or {}
-            current_step = session_data.get('current_step', 0) if isinstance(session_data, dict) else 0
+            session_data = view.data
+            metadata = _as_dict(metadata)
+            current_step = session_data.get('current_step', 0)
             # Get selected condition from session
-            selected_condition = session_data.get('selected_condition', '') if isinstance(session_data, dict) else ''
-            if not selected_condition and metadata:
-                selected_condition = metadata.get('condition', '') if isinstance(metadata, dict) else ''
+            selected_condition = session_data.get('selected_condition', '')
+            if not selected_condition:
+                selected_condition = metadata.get('condition', '')
             if not selected_condition:
                 return {
                     "error": True,
@@ -311,7 +445,7 @@ class Orchestrator:
             # Handle different steps in the screening flow
             if current_step == 0:  # Condition selection
                 # Condition already selected from triage, move to next step
-                SessionManager.advance_step(session_id)
+                view.advance_step()
                 return {
                     "success": True,
                     "selected_condition": selected_condition,
@@ -319,24 +453,13 @@ class Orchestrator:
                 }
             elif current_step == 1:  # Question collection
                 # Collect user responses
-                responses = []
-                if metadata and isinstance(metadata, dict) and 'responses' in metadata:
-                    responses = metadata['responses']
-                else:
-                    responses = [user_input]
+                responses = metadata.get('responses') or [user_input]
                 # Store responses in session
-                SessionManager.update_session(session_id, {
-                    "screening_responses": responses
-                })
+                view.set("screening_responses", responses)
                 # Move to analysis step
-                SessionManager.advance_step(session_id)
+                view.advance_step()
                 # Perform screening analysis
-                loop = asyncio.get_event_loop()
-                with ThreadPoolExecutor() as executor:
-                    screening_result = await loop.run_in_executor(
-                        executor,
-                        lambda: self.screening_client.screen_condition(selected_condition, responses)
-                    )
+                screening_result = await self.screening_client.screen_condition_async(selected_condition, responses)
                 if not screening_result or not screening_result.get("success", False):
                     return {
                         "error": True,
@@ -344,22 +467,31 @@ class Orchestrator:
                         "response": "I'm having trouble analyzing your responses. Could you please provide more details?"
                     }
                 # Store screening result in session
-                screening_data = screening_result.get("screening_result", {}) if isinstance(screening_result, dict) else {}
-                SessionManager.set_screening_data(session_id, selected_condition, screening_data)
+                screening_data = _as_dict(screening_result.get("screening_result"))
+                view.set_screening_data(selected_condition, screening_data)
                 # Move to recommendation step
-                SessionManager.advance_step(session_id)
+                view.advance_step()
                 # Generate response with recommendations
-                risk_level = screening_data.get("risk_level", "low") if isinstance(screening_data, dict) else "low"
-                urgency = screening_data.get("urgency", "routine") if isinstance(screening_data, dict) else "routine"
-                assessment = screening_data.get("assessment", "") if isinstance(screening_data, dict) else ""
-                recommendations = screening_data.get("recommendations", {}) if isinstance(screening_data, dict) else {}
-                response = f"Based on your description about {selected_condition}, here's my assessment:\n\n"
-                response += f"{assessment}\n\n"
-                response += f"Risk Level: {risk_level.capitalize()}\n"
-                response += f"Recommended Action: {recommendations.get('action', '')}\n"
-                response += f"Timeframe: {recommendations.get('timeframe', '')}\n\n"
-                response += f"Things to monitor: {recommendations.get('monitoring', '')}\n"
-                response += f"Warning signs: {recommendations.get('warning_signs', '')}"
+                risk_level = screening_data.get("risk_level", "low")
+                urgency = screening_data.get("urgency", "routine")
+                assessment = screening_data.get("assessment", "")
+                recommendations = _as_dict(screening_data.get("recommendations"))
+                action = recommendations.get('action', '')
+                timeframe = recommendations.get('timeframe', '')
+                monitoring = recommendations.get('monitoring', '')
+                warning_signs = recommendations.get('warning_signs', '')
+                response = "\n".join((
+                    f"Based on your description about {selected_condition}, here's my assessment:",
+                    "",
+                    f"{assessment}",
+                    "",
+                    f"Risk Level: {risk_level.capitalize()}",
+                    f"Recommended Action: {action}",
+                    f"Timeframe: {timeframe}",
+                    "",
+                    f"Things to monitor: {monitoring}",
+                    f"Warning signs: {warning_signs}"
+                ))
                 return {
                     "success": True,
                     "screening_data": screening_data,
@@ -368,8 +500,8 @@ class Orchestrator:
                 }
             else:  # Other steps (analysis, recommendation already handled)
                 # Provide advice based on previous screening
-                screening_data_dict = session_data.get('screening_data', {}) if isinstance(session_data, dict) else {}
-                screening_data = screening_data_dict.get(selected_condition, {}) if isinstance(screening_data_dict, dict) else {}
+                screening_data_dict = _as_dict(session_data.get('screening_data'))
+                screening_data = _as_dict(screening_data_dict.get(selected_condition))
                 if not screening_data:
                     return {
                         "error": True,
@@ -377,18 +509,21 @@ class Orchestrator:
                         "response": "I don't have enough information to provide specific guidance. Could you please describe the symptoms again?"
                     }
                 # Get additional advice
-                loop = asyncio.get_event_loop()
-                with ThreadPoolExecutor() as executor:
-                    advice_result = await loop.run_in_executor(
-                        executor,
-                        lambda: self.advice_client.get_advice(selected_condition, user_input)
-                    )
+                advice_result = await self._cached_call(
+                    self._cache_key("adv", selected_condition, user_input),
+                    lambda: self.advice_client.get_advice_async(selected_condition, user_input)
+                )
                 if not advice_result or not advice_result.get("success", False):
                     # Fallback to existing screening data
-                    recommendations = screening_data.get("recommendations", {}) if isinstance(screening_data, dict) else {}
-                    response = f"For {selected_condition}, I recommend:\n\n"
-                    response += f"- {recommendations.get('action', 'Consult with a healthcare professional')}\n"
-                    response += f"- {recommendations.get('monitoring', 'Monitor symptoms closely')}"
+                    recommendations = _as_dict(screening_data.get("recommendations"))
+                    action = recommendations.get('action', 'Consult with a healthcare professional')
+                    monitoring = recommendations.get('monitoring', 'Monitor symptoms closely')
+                    response = "\n".join((
+                        f"For {selected_condition}, I recommend:",
+                        "",
+                        f"- {action}",
+                        f"- {monitoring}"
+                    ))
                     return {
                         "success": True,
                         "screening_data": screening_data,
@@ -396,11 +531,19 @@ class Orchestrator:
                         "response": response
                     }
                 # Combine screening data with advice
-                advice_data = advice_result.get("advice_result", {}) if advice_result else {}
-                response = f"Regarding {selected_condition}:\n\n"
-                response += f"{advice_data.get('advice', '')}\n\n"
-                response += f"Home care: {advice_data.get('home_care', '')}\n\n"
-                response += f"When to consult a doctor: {advice_data.get('when_to_consult', '')}"
+                advice_data = _as_dict(advice_result.get("advice_result"))
+                advice = advice_data.get('advice', '')
+                home_care = advice_data.get('home_care', '')
+                when_to_consult = advice_data.get('when_to_consult', '')
+                response = "\n".join((
+                    f"Regarding {selected_condition}:",
+                    "",
+                    f"{advice}",
+                    "",
+                    f"Home care: {home_care}",
+                    "",
+                    f"When to consult a doctor: {when_to_consult}"
+                ))
                 return {
                     "success": True,
                     "screening_data": screening_data,
@@ -410,49 +553,54 @@ class Orchestrator:
                 }
             
         except Exception as e:
-            logger.error(f"Error in screening flow: {e}")
+            logger.error("Error in screening flow: %s", e)
             return {
                 "error": True,
                 "error_message": str(e),
                 "response": "I'm having trouble processing your screening information. Please try again."
             }
     
-    async def _handle_red_flag_flow(self, user_input: str, session_id: str) -> Dict[str, Any]:
+    async def _handle_red_flag_flow(self, user_input: str, view: _SessionView, metadata: Optional[Dict] = None) -> Dict[str, Any]:
         """Handle the red flag flow"""
         try:
-            session_data = SessionManager.get_session(session_id) or {}
-            red_flags = session_data.get('red_flags', []) if isinstance(session_data, dict) else []
+            session_data = view.data
+            red_flags = session_data.get('red_flags', [])
             if not red_flags:
                 # No red flags found, revert to triage flow
-                SessionManager.set_flow_type(session_id, FLOW_TYPES['TRIAGE'])
-                return await self._handle_triage_flow(user_input, session_id)
+                view.set_flow_type(_FT_TRIAGE)
+                return await self._handle_triage_flow(user_input, view)
             # Get the most recent red flag
-            latest_red_flag = red_flags[-1] if isinstance(red_flags, list) and red_flags else {}
+            latest_red_flag = _as_dict(red_flags[-1] if isinstance(red_flags, list) else None)
             # Get additional advice for the emergency
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                advice_result = await loop.run_in_executor(
-                    executor,
-                    lambda: self.advice_client.get_advice("emergency", user_input)
-                )
+            advice_result = await self._cached_call(
+                self._cache_key("adv", "emergency", user_input),
+                lambda: self.advice_client.get_advice_async("emergency", user_input)
+            )
             if not advice_result or not advice_result.get("success", False):
                 # Fallback to red flag data
-                reasoning = latest_red_flag.get('reasoning', 'This appears to be an emergency situation.') if isinstance(latest_red_flag, dict) else 'This appears to be an emergency situation.'
-                recommendation = latest_red_flag.get('recommendation', 'Please seek immediate medical attention.') if isinstance(latest_red_flag, dict) else 'Please seek immediate medical attention.'
-                response = f"URGENT: {reasoning}\n\n"
-                response += f"Recommendation: {recommendation}"
+                reasoning = latest_red_flag.get('reasoning', 'This appears to be an emergency situation.')
+                recommendation = latest_red_flag.get('recommendation', 'Please seek immediate medical attention.')
+                response = "\n".join((
+                    f"URGENT: {reasoning}",
+                    "",
+                    f"Recommendation: {recommendation}"
+                ))
                 return {
                     "success": True,
                     "red_flag": latest_red_flag,
                     "response": response
                 }
             # Combine red flag with advice
-            advice_data = advice_result.get("advice_result", {}) if advice_result else {}
-            reasoning = latest_red_flag.get('reasoning', 'This appears to be an emergency situation.') if isinstance(latest_red_flag, dict) else 'This appears to be an emergency situation.'
-            recommendation = latest_red_flag.get('recommendation', 'Please seek immediate medical attention.') if isinstance(latest_red_flag, dict) else 'Please seek immediate medical attention.'
-            response = f"URGENT: {reasoning}\n\n"
-            response += f"Recommendation: {recommendation}\n\n"
-            response += f"While seeking help: {advice_data.get('home_care', '')}"
+            advice_data = _as_dict(advice_result.get("advice_result"))
+            reasoning = latest_red_flag.get('reasoning', 'This appears to be an emergency situation.')
+            recommendation = latest_red_flag.get('recommendation', 'Please seek immediate medical attention.')
+            response = "\n".join((
+                f"URGENT: {reasoning}",
+                "",
+                f"Recommendation: {recommendation}",
+                "",
+                f"While seeking help: {advice_data.get('home_care', '')}"
+            ))
             return {
                 "success": True,
                 "red_flag": latest_red_flag,
@@ -460,17 +608,17 @@ class Orchestrator:
                 "response": response
             }
         except Exception as e:
-            logger.error(f"Error in red flag flow: {e}")
+            logger.error("Error in red flag flow: %s", e)
             return {
                 "error": True,
                 "error_message": str(e),
                 "response": "This appears to be an urgent situation. Please seek immediate medical attention."
             }
     
-    async def _handle_follow_up_flow(self, user_input: str, session_id: str) -> Dict[str, Any]:
+    async def _handle_follow_up_flow(self, user_input: str, view: _SessionView, metadata: Optional[Dict] = None) -> Dict[str, Any]:
         """Handle the follow-up flow with full context and safety checks"""
         try:
-            session_data = SessionManager.get_session(session_id) or {}
+            session_data = view.data
             if not session_data:
                 return {
                     "error": True,
@@ -494,19 +642,23 @@ class Orchestrator:
                 context_lines.append(f"- Screening data: {screening_data}")
             if red_flags:
                 context_lines.append(f"- Red flags: {red_flags}")
-            context_lines.append(f"- Previous conversation: {[{'role': m.get('role', ''), 'content': m.get('content', '')} for m in conversation_history[-5:]]}")
+            recent_history = [
+                {'role': m.get('role', ''), 'content': m.get('content', '')}
+                for m in conversation_history[-_HISTORY_TAIL:]
+            ]
+            context_lines.append(f"- Previous conversation: {recent_history}")
             context_lines.append(f"- Parent follow-up question: {user_input}")
             context_lines.append("Instructions: Provide clear, safe, evidence-based advice. If the follow-up question suggests a new red flag, escalate and recommend immediate medical attention.")
             prompt = "\n".join(context_lines)
 
-            # Red flag check on follow-up question
-            red_flag_result = self.red_flag_client.detect_red_flags(user_input) or {}
+            # Red flag check on follow-up question; goes through the cached
+            # async path so the event loop is never blocked on the HTTP call
+            red_flag_result = _as_dict((await self._check_red_flags(user_input)).get('red_flag_result'))
             if red_flag_result.get('red_flag_detected'):
                 # Escalate to red flag flow
-                SessionManager.set_flow_type(session_id, 'red_flag')
-                SessionManager.add_red_flag(session_id, red_flag_result)
+                view.set_flow_type(_FT_RED_FLAG)
+                view.add_red_flag(red_flag_result)
                 response = f"⚠️ URGENT: {red_flag_result.get('reasoning', 'This appears to be an emergency situation.')}\n\nRecommendation: {red_flag_result.get('recommendation', 'Please seek immediate medical attention.')}"
-                SessionManager.add_message_to_history(session_id, "system", response)
                 return {
                     "success": True,
                     "response": response,
@@ -515,7 +667,11 @@ class Orchestrator:
                 }
 
             # Call Gemini for follow-up advice
-            advice_result = self.advice_client.get_advice(selected_condition if selected_condition else "follow_up", prompt) or {}
+            advice_topic = selected_condition if selected_condition else "follow_up"
+            advice_result = await self._cached_call(
+                self._cache_key("adv", advice_topic, prompt),
+                lambda: self.advice_client.get_advice_async(advice_topic, prompt)
+            ) or {}
             if not advice_result.get("success", False):
                 return {
                     "error": True,
@@ -524,10 +680,9 @@ class Orchestrator:
                 }
             advice_data = advice_result.get("advice_result", {}) or {}
             response = f"{advice_data.get('advice', '')}\n\nFor ongoing care: {advice_data.get('home_care', '')}\n\nWhen to consult again: {advice_data.get('when_to_consult', '')}"
-            # Update session with follow-up Q&A
-            SessionManager.add_message_to_history(session_id, "user", user_input)
-            SessionManager.add_message_to_history(session_id, "system", response)
-            SessionManager.set_flow_type(session_id, 'follow_up')
+            # History writes happen once in process_message; only the flow
+            # type needs updating here
+            view.set_flow_type(_FT_FOLLOW_UP)
             return {
                 "success": True,
                 "advice_data": advice_data,
@@ -535,38 +690,43 @@ class Orchestrator:
                 "flow_type": "follow_up"
             }
         except Exception as e:
-            logger.error(f"Error in follow-up flow: {e}")
+            logger.error("Error in follow-up flow: %s", e)
             return {
                 "error": True,
                 "error_message": str(e),
                 "response": "For follow-up concerns, I recommend consulting with your healthcare provider."
             }
     
-    async def _handle_red_flag_detected(self, red_flag_result: Dict[str, Any], session_id: str) -> Dict[str, Any]:
+    async def _handle_red_flag_detected(self, red_flag_result: Dict[str, Any], view: _SessionView) -> Dict[str, Any]:
         """Handle when a red flag is detected"""
         try:
             red_flag_data = red_flag_result.get("red_flag_result", {})
             
             # Add red flag to session
-            SessionManager.add_red_flag(session_id, red_flag_data)
+            view.add_red_flag(red_flag_data)
             
             # Transition to red flag flow
-            SessionManager.set_flow_type(session_id, FLOW_TYPES['RED_FLAG'])
+            view.set_flow_type(_FT_RED_FLAG)
             
             # Generate response for red flag
             emergency_level = red_flag_data.get("emergency_level", "high")
             reasoning = red_flag_data.get("reasoning", "This appears to be an emergency situation.")
             recommendation = red_flag_data.get("recommendation", "Please seek immediate medical attention.")
             
-            response = f"URGENT: {reasoning}\n\n"
-            response += f"Recommendation: {recommendation}"
-            
             if emergency_level == "high":
-                response += "\n\nPlease seek immediate emergency care."
+                escalation = "Please seek immediate emergency care."
             elif emergency_level == "medium":
-                response += "\n\nPlease contact your healthcare provider right away."
+                escalation = "Please contact your healthcare provider right away."
             else:
-                response += "\n\nPlease consult with a healthcare provider as soon as possible."
+                escalation = "Please consult with a healthcare provider as soon as possible."
+            
+            response = "\n".join((
+                f"URGENT: {reasoning}",
+                "",
+                f"Recommendation: {recommendation}",
+                "",
+                escalation
+            ))
             
             return {
                 "success": True,
@@ -576,7 +736,7 @@ class Orchestrator:
             }
             
         except Exception as e:
-            logger.error(f"Error handling red flag: {e}")
+            logger.error("Error handling red flag: %s", e)
             return {
                 "error": True,
                 "error_message": str(e),
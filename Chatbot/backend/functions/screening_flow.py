@@ -4,156 +4,197 @@ Manages the state transitions for the screening process
 """
 
 from typing import Dict, Any, Optional, List, Tuple
-from enum import Enum
+from enum import IntEnum
 from .session_manager import SessionManager, FLOW_TYPES
 
-# Define screening flow states
-class ScreeningState(Enum):
-    INITIAL = "initial"
-    TRIAGE = "triage"
-    CONDITION_SELECTION = "condition_selection"
-    QUESTION_COLLECTION = "question_collection"
-    ANALYSIS = "analysis"
-    RECOMMENDATION = "recommendation"
-    RED_FLAG_DETECTED = "red_flag_detected"
-    FOLLOW_UP = "follow_up"
-    COMPLETED = "completed"
-    ERROR = "error"
-
-# Define screening flow transitions
-TRANSITIONS = {
-    ScreeningState.INITIAL: [ScreeningState.TRIAGE],
-    ScreeningState.TRIAGE: [
-        ScreeningState.CONDITION_SELECTION, 
-        ScreeningState.RED_FLAG_DETECTED
-    ],
-    ScreeningState.CONDITION_SELECTION: [ScreeningState.QUESTION_COLLECTION],
-    ScreeningState.QUESTION_COLLECTION: [
-        ScreeningState.ANALYSIS, 
-        ScreeningState.RED_FLAG_DETECTED
-    ],
-    ScreeningState.ANALYSIS: [ScreeningState.RECOMMENDATION],
-    ScreeningState.RECOMMENDATION: [
-        ScreeningState.FOLLOW_UP, 
-        ScreeningState.COMPLETED
-    ],
-    ScreeningState.RED_FLAG_DETECTED: [ScreeningState.COMPLETED],
-    ScreeningState.FOLLOW_UP: [ScreeningState.COMPLETED],
-    ScreeningState.COMPLETED: [],
-    ScreeningState.ERROR: [
-        ScreeningState.INITIAL, 
-        ScreeningState.TRIAGE, 
-        ScreeningState.COMPLETED
+# Define screening flow states. IntEnum members are compact ints, so the
+# transition table can be a tuple indexed by state and the validity check a
+# single integer AND instead of hashing enum objects
+class ScreeningState(IntEnum):
+    INITIAL = 0
+    TRIAGE = 1
+    CONDITION_SELECTION = 2
+    QUESTION_COLLECTION = 3
+    ANALYSIS = 4
+    RECOMMENDATION = 5
+    RED_FLAG_DETECTED = 6
+    FOLLOW_UP = 7
+    COMPLETED = 8
+    ERROR = 9
+
+def _mask(*states: ScreeningState) -> int:
+    mask = 0
+    for state in states:
+        mask |= 1 << state
+    return mask
+
+# Allowed transitions as one bitmask per state, indexed by the source state;
+# bit n set means transitioning to state n is valid
+TRANSITIONS = (
+    _mask(ScreeningState.TRIAGE),                                               # INITIAL
+    _mask(ScreeningState.CONDITION_SELECTION, ScreeningState.RED_FLAG_DETECTED),  # TRIAGE
+    _mask(ScreeningState.QUESTION_COLLECTION),                                  # CONDITION_SELECTION
+    _mask(ScreeningState.ANALYSIS, ScreeningState.RED_FLAG_DETECTED),           # QUESTION_COLLECTION
+    _mask(ScreeningState.RECOMMENDATION),                                       # ANALYSIS
+    _mask(ScreeningState.FOLLOW_UP, ScreeningState.COMPLETED),                  # RECOMMENDATION
+    _mask(ScreeningState.COMPLETED),                                            # RED_FLAG_DETECTED
+    _mask(ScreeningState.COMPLETED),                                            # FOLLOW_UP
+    0,                                                                          # COMPLETED
+    _mask(ScreeningState.INITIAL, ScreeningState.TRIAGE, ScreeningState.COMPLETED)  # ERROR
+)
+
+# Flow-type/step <-> state mappings, built once at import instead of being
+# re-created (and walked with elif chains) on every call
+_FLOW_TO_STATE = {
+    FLOW_TYPES['INITIAL']: ScreeningState.INITIAL,
+    FLOW_TYPES['TRIAGE']: ScreeningState.TRIAGE,
+    FLOW_TYPES['RED_FLAG']: ScreeningState.RED_FLAG_DETECTED,
+    FLOW_TYPES['FOLLOW_UP']: ScreeningState.FOLLOW_UP
+}
+
+# Screening-flow steps in order; the step number indexes this tuple
+_SCREENING_STEPS = (
+    ScreeningState.CONDITION_SELECTION,
+    ScreeningState.QUESTION_COLLECTION,
+    ScreeningState.ANALYSIS,
+    ScreeningState.RECOMMENDATION
+)
+
+# A session's stored state as a compact token: the flow type, or
+# 'screening:<step>' within the screening flow. COMPLETED and ERROR have no
+# token - they are never what a live session's fields encode
+_STATE_TOKENS = {
+    ScreeningState.INITIAL: FLOW_TYPES['INITIAL'],
+    ScreeningState.TRIAGE: FLOW_TYPES['TRIAGE'],
+    ScreeningState.CONDITION_SELECTION: 'screening:0',
+    ScreeningState.QUESTION_COLLECTION: 'screening:1',
+    ScreeningState.ANALYSIS: 'screening:2',
+    ScreeningState.RECOMMENDATION: 'screening:3',
+    ScreeningState.RED_FLAG_DETECTED: FLOW_TYPES['RED_FLAG'],
+    ScreeningState.FOLLOW_UP: FLOW_TYPES['FOLLOW_UP']
+}
+_KNOWN_TOKENS = list(_STATE_TOKENS.values())
+
+# For each target state, the tokens of the states allowed to transition to
+# it, and whether the unrepresentable ERROR state is among them
+_PREDECESSOR_TOKENS = {}
+_ALLOW_FROM_ERROR = {}
+for _target in ScreeningState:
+    _bit = 1 << _target
+    _sources = [_state for _state in ScreeningState if TRANSITIONS[_state] & _bit]
+    _PREDECESSOR_TOKENS[_target] = [
+        _STATE_TOKENS[_state] for _state in _sources if _state in _STATE_TOKENS
     ]
+    _ALLOW_FROM_ERROR[_target] = ScreeningState.ERROR in _sources
+
+# Target state -> (flow_type, current_step) for transition_to
+_STATE_TO_FLOW_STEP = {
+    ScreeningState.TRIAGE: (FLOW_TYPES['TRIAGE'], 0),
+    ScreeningState.CONDITION_SELECTION: (FLOW_TYPES['SCREENING'], 0),
+    ScreeningState.QUESTION_COLLECTION: (FLOW_TYPES['SCREENING'], 1),
+    ScreeningState.ANALYSIS: (FLOW_TYPES['SCREENING'], 2),
+    ScreeningState.RECOMMENDATION: (FLOW_TYPES['SCREENING'], 3),
+    ScreeningState.RED_FLAG_DETECTED: (FLOW_TYPES['RED_FLAG'], 0),
+    ScreeningState.FOLLOW_UP: (FLOW_TYPES['FOLLOW_UP'], 0)
 }
 
+# Static next-action responses, a tuple indexed by state value; None marks
+# the states handled specially (CONDITION_SELECTION needs session data,
+# ERROR falls through to the error response). Callers get a copy so
+# mutating a response can't poison the table
+_NEXT_ACTION = (
+    {'action': 'start_triage', 'message': 'Please describe the symptoms or concerns'},   # INITIAL
+    {'action': 'perform_triage', 'message': 'Analyzing symptoms...'},                    # TRIAGE
+    None,                                                                                # CONDITION_SELECTION
+    {'action': 'analyze_responses', 'message': 'Analyzing responses...'},                # QUESTION_COLLECTION
+    {'action': 'provide_recommendation', 'message': 'Generating recommendations...'},    # ANALYSIS
+    {'action': 'complete_screening', 'message': 'Screening completed'},                  # RECOMMENDATION
+    {'action': 'handle_red_flag', 'message': 'Red flag detected! Urgent attention required.'},  # RED_FLAG_DETECTED
+    {'action': 'schedule_follow_up', 'message': 'Please schedule a follow-up appointment'},     # FOLLOW_UP
+    {'action': 'start_new_session', 'message': 'Screening completed. Start a new session?'},    # COMPLETED
+    None                                                                                 # ERROR
+)
+
+def _state_for(flow_type: Optional[str], current_step: int) -> ScreeningState:
+    """Map a (flow_type, current_step) pair to its screening state"""
+    if flow_type == FLOW_TYPES['SCREENING']:
+        if 0 <= current_step < len(_SCREENING_STEPS):
+            return _SCREENING_STEPS[current_step]
+        return ScreeningState.ERROR
+    return _FLOW_TO_STATE.get(flow_type, ScreeningState.ERROR)
+
 class ScreeningFlow:
     """Manages the screening flow state machine"""
 
     @staticmethod
-    def get_current_state(session_id: str) -> Optional[ScreeningState]:
-        """Get the current state for a session"""
-        session_data = SessionManager.get_session(session_id)
+    def get_current_state(session_id: str, session_data: Optional[Dict[str, Any]] = None) -> Optional[ScreeningState]:
+        """Get the current state for a session
+
+        Callers that already hold the session data can pass it in to avoid
+        a second store round-trip.
+        """
+        if session_data is None:
+            session_data = SessionManager.get_session(session_id)
         if not session_data:
             return None
             
-        # Map flow_type and current_step to a state
-        flow_type = session_data.get('flow_type')
-        current_step = session_data.get('current_step', 0)
-        
-        if flow_type == FLOW_TYPES['INITIAL']:
-            return ScreeningState.INITIAL
-        elif flow_type == FLOW_TYPES['TRIAGE']:
-            return ScreeningState.TRIAGE
-        elif flow_type == FLOW_TYPES['SCREENING']:
-            # Map screening steps to states
-            screening_steps = {
-                0: ScreeningState.CONDITION_SELECTION,
-                1: ScreeningState.QUESTION_COLLECTION,
-                2: ScreeningState.ANALYSIS,
-                3: ScreeningState.RECOMMENDATION
-            }
-            return screening_steps.get(current_step, ScreeningState.ERROR)
-        elif flow_type == FLOW_TYPES['RED_FLAG']:
-            return ScreeningState.RED_FLAG_DETECTED
-        elif flow_type == FLOW_TYPES['FOLLOW_UP']:
-            return ScreeningState.FOLLOW_UP
-        
-        return ScreeningState.ERROR
+        return _state_for(session_data.get('flow_type'), session_data.get('current_step', 0))
 
     @staticmethod
     def can_transition_to(current_state: ScreeningState, target_state: ScreeningState) -> bool:
         """Check if a transition from current_state to target_state is valid"""
-        if current_state not in TRANSITIONS:
-            return False
-            
-        return target_state in TRANSITIONS[current_state]
+        return bool(TRANSITIONS[current_state] & (1 << target_state))
 
     @staticmethod
     def transition_to(session_id: str, target_state: ScreeningState) -> bool:
-        """Transition a session to a new state"""
-        current_state = ScreeningFlow.get_current_state(session_id)
-        if not current_state:
-            return False
-            
-        if not ScreeningFlow.can_transition_to(current_state, target_state):
-            return False
-            
+        """Transition a session to a new state
+
+        Validation and write happen server-side in one atomic call; the old
+        read-validate-write sequence cost two session reads and left a race
+        window between the check and the update.
+        """
         # Map the target state to flow_type and current_step
-        flow_type = FLOW_TYPES['INITIAL']
-        current_step = 0
+        flow_type, current_step = _STATE_TO_FLOW_STEP.get(
+            target_state, (FLOW_TYPES['INITIAL'], 0)
+        )
         
-        if target_state == ScreeningState.TRIAGE:
-            flow_type = FLOW_TYPES['TRIAGE']
-        elif target_state in [
-            ScreeningState.CONDITION_SELECTION,
-            ScreeningState.QUESTION_COLLECTION,
-            ScreeningState.ANALYSIS,
-            ScreeningState.RECOMMENDATION
-        ]:
-            flow_type = FLOW_TYPES['SCREENING']
-            # Map states to steps
-            step_mapping = {
-                ScreeningState.CONDITION_SELECTION: 0,
-                ScreeningState.QUESTION_COLLECTION: 1,
-                ScreeningState.ANALYSIS: 2,
-                ScreeningState.RECOMMENDATION: 3
-            }
-            current_step = step_mapping.get(target_state, 0)
-        elif target_state == ScreeningState.RED_FLAG_DETECTED:
-            flow_type = FLOW_TYPES['RED_FLAG']
-        elif target_state == ScreeningState.FOLLOW_UP:
-            flow_type = FLOW_TYPES['FOLLOW_UP']
-            
-        # Update the session
-        return SessionManager.update_session(
+        return SessionManager.transition_session(
             session_id,
-            {
-                'flow_type': flow_type,
-                'current_step': current_step
-            }
+            flow_type,
+            current_step,
+            allowed_tokens=_PREDECESSOR_TOKENS[target_state],
+            known_tokens=_KNOWN_TOKENS,
+            allow_from_unknown=_ALLOW_FROM_ERROR[target_state]
         )
 
     @staticmethod
-    def get_next_action(session_id: str) -> Dict[str, Any]:
-        """Get the next action for the current state"""
-        current_state = ScreeningFlow.get_current_state(session_id)
+    def get_next_action(session_id: str, session_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get the next action for the current state
+
+        A convenience wrapper that loads the session (once) and derives the
+        state. Callers that already hold both should use _next_action_for
+        directly and skip the store read entirely.
+        """
+        if session_data is None:
+            # Only CONDITION_SELECTION needs the full session; everything
+            # else is answered from the two flow-state hash fields
+            flow_state = SessionManager.get_flow_state(session_id)
+            if flow_state is None:
+                return {'action': 'create_session', 'message': 'Session not found'}
+            current_state = _state_for(*flow_state)
+            if current_state is ScreeningState.CONDITION_SELECTION:
+                session_data = SessionManager.get_session(session_id)
+            return ScreeningFlow._next_action_for(current_state, session_data)
+        
+        current_state = ScreeningFlow.get_current_state(session_id, session_data)
         if not current_state:
             return {'action': 'create_session', 'message': 'Session not found'}
-            
-        session_data = SessionManager.get_session(session_id)
-        
-        if current_state == ScreeningState.INITIAL:
-            return {
-                'action': 'start_triage',
-                'message': 'Please describe the symptoms or concerns'
-            }
-        elif current_state == ScreeningState.TRIAGE:
-            return {
-                'action': 'perform_triage',
-                'message': 'Analyzing symptoms...'
-            }
-        elif current_state == ScreeningState.CONDITION_SELECTION:
+        return ScreeningFlow._next_action_for(current_state, session_data)
+
+    @staticmethod
+    def _next_action_for(current_state: ScreeningState, session_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Pure mapping from a state (plus session data) to the next action"""
+        if current_state == ScreeningState.CONDITION_SELECTION:
             # Check if a condition has already been selected
             if session_data and 'selected_condition' in session_data:
                 return {
@@ -161,46 +202,18 @@ class ScreeningFlow:
                     'condition': session_data['selected_condition'],
                     'message': 'Please answer the following questions'
                 }
-            else:
-                return {
-                    'action': 'select_condition',
-                    'message': 'Please select a condition to screen for'
-                }
-        elif current_state == ScreeningState.QUESTION_COLLECTION:
-            return {
-                'action': 'analyze_responses',
-                'message': 'Analyzing responses...'
-            }
-        elif current_state == ScreeningState.ANALYSIS:
-            return {
-                'action': 'provide_recommendation',
-                'message': 'Generating recommendations...'
-            }
-        elif current_state == ScreeningState.RECOMMENDATION:
-            return {
-                'action': 'complete_screening',
-                'message': 'Screening completed'
-            }
-        elif current_state == ScreeningState.RED_FLAG_DETECTED:
-            return {
-                'action': 'handle_red_flag',
-                'message': 'Red flag detected! Urgent attention required.'
-            }
-        elif current_state == ScreeningState.FOLLOW_UP:
             return {
-                'action': 'schedule_follow_up',
-                'message': 'Please schedule a follow-up appointment'
+                'action': 'select_condition',
+                'message': 'Please select a condition to screen for'
             }
-        elif current_state == ScreeningState.COMPLETED:
-            return {
-                'action': 'start_new_session',
-                'message': 'Screening completed. Start a new session?'
-            }
-        else:
+        
+        base = _NEXT_ACTION[current_state]
+        if base is None:
             return {
                 'action': 'handle_error',
                 'message': 'An error occurred in the screening flow'
             }
+        return dict(base)
 
     @staticmethod
     def handle_red_flag_resume(session_id: str) -> Dict[str, Any]:
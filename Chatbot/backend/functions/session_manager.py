@@ -3,13 +3,16 @@ Session Manager for Pukaar-GPT
 Handles user session management, persistence, and state tracking
 """
 
-import json
-import uuid
+import secrets
+import threading
 import time
 from typing import Dict, Any, Optional, List, Union
+import orjson
 import redis
 import os
 
+from cachetools import LRUCache, TTLCache
+
 # Initialize Redis client
 REDIS_HOST = os.environ.get('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.environ.get('REDIS_PORT', 6379))
@@ -19,6 +22,13 @@ REDIS_DB = int(os.environ.get('REDIS_DB', 0))
 # Session expiration time (24 hours in seconds)
 SESSION_EXPIRY = 86400
 
+# Keep only the newest messages hot; every append LTRIMs the history list
+# so per-request Redis bandwidth and decode cost stay O(MAX_HISTORY_MESSAGES)
+# no matter how old the session is. Older messages are dropped rather than
+# archived: nothing in the product reads beyond the recent tail and whole
+# sessions expire after 24 hours anyway.
+MAX_HISTORY_MESSAGES = 64
+
 # Flow types
 FLOW_TYPES = {
     'INITIAL': 'initial',
@@ -31,30 +41,145 @@ FLOW_TYPES = {
 
 # Try to connect to Redis, fallback to in-memory storage if Redis is not available
 try:
-    redis_client = redis.Redis(
+    # A sized blocking pool shared by all worker threads: bursts wait up to
+    # a second for a free connection instead of churning new TCP+AUTH
+    # handshakes, keepalive stops idle connections from being silently
+    # dropped by middleboxes, and the health check revalidates connections
+    # that sat unused
+    redis_pool = redis.BlockingConnectionPool(
         host=REDIS_HOST,
         port=REDIS_PORT,
         password=REDIS_PASSWORD,
         db=REDIS_DB,
-        decode_responses=True
+        max_connections=64,
+        timeout=1,
+        socket_keepalive=True,
+        socket_connect_timeout=1.0,
+        socket_timeout=1.0,
+        health_check_interval=30,
+        # orjson consumes and produces bytes; skipping redis-py's per-value
+        # UTF-8 decode avoids one copy per field on every read
+        decode_responses=False
     )
+    redis_client = redis.Redis(connection_pool=redis_pool)
     redis_client.ping()  # Test connection
     print("[INFO] Connected to Redis successfully")
     USE_REDIS = True
 except Exception as e:
     print(f"[WARNING] Redis connection failed: {e}. Using in-memory session storage.")
     USE_REDIS = False
-    # In-memory session storage as fallback
-    in_memory_sessions = {}
+    # In-memory session storage as fallback; TTLCache gives it the same 24h
+    # expiry as Redis and a hard size cap so it cannot grow without bound
+    in_memory_sessions = TTLCache(maxsize=100_000, ttl=SESSION_EXPIRY)
+
+# Guards the fallback store - plain dict ops are not safe under the
+# threaded Flask workers
+_fallback_lock = threading.RLock()
+
+# Storage layout: one Redis hash per session for the scalar/nested fields
+# (each value JSON-encoded), plus a list per session for conversation
+# history and red flags.
+#
+# Values stay JSON (via orjson) rather than msgpack: current_step must be a
+# bare integer string for HINCRBY to work server-side, and the transition
+# Lua script parses fields with cjson. msgpack's ~30% size win on the nested
+# payloads is not worth giving up both, and orjson already decodes them at
+# native speed. Appends are an RPUSH of one message instead of a
+# full-session read-decode-mutate-encode-SETEX cycle, and field updates
+# only send the changed fields over the wire.
+#
+# session:{id}            hash  flow_type, current_step, screening_data, ...
+# session:{id}:history    list  one JSON message per entry (newest last)
+# session:{id}:red_flags  list  one JSON red flag per entry
+
+# Short-lived in-process cache in front of get_session: within one HTTP
+# request the flow helpers read the same session several times, each a
+# Redis round trip plus JSON decodes. Two seconds is long enough to cover
+# a request and short enough that cross-worker staleness doesn't matter;
+# every write path invalidates the entry anyway.
+_SESSION_CACHE_TTL = 2  # seconds
+_session_cache = TTLCache(maxsize=4096, ttl=_SESSION_CACHE_TTL)
+_session_cache_lock = threading.RLock()
+
+def _invalidate(session_id: str) -> None:
+    with _session_cache_lock:
+        _session_cache.pop(session_id, None)
+
+# Pre-encoded key bytes per session, so hot paths skip re-formatting and
+# UTF-8-encoding the same three key strings on every Redis call. The LRU cap
+# keeps the cache bounded across many sessions.
+_key_cache = LRUCache(maxsize=4096)
+_key_cache_lock = threading.Lock()
+
+def _keys(session_id: str) -> tuple:
+    with _key_cache_lock:
+        keys = _key_cache.get(session_id)
+        if keys is None:
+            keys = (
+                f"session:{session_id}".encode(),
+                f"session:{session_id}:history".encode(),
+                f"session:{session_id}:red_flags".encode()
+            )
+            _key_cache[session_id] = keys
+        return keys
+
+def _session_key(session_id: str) -> bytes:
+    return _keys(session_id)[0]
+
+def _history_key(session_id: str) -> bytes:
+    return _keys(session_id)[1]
+
+def _red_flags_key(session_id: str) -> bytes:
+    return _keys(session_id)[2]
+
+
+# Validated state transition as one atomic server-side op: read the current
+# flow_type/current_step, check the caller-supplied allowed set, write the
+# new values and refresh the TTL - one round trip, no read-check-write race.
+# Tokens are 'flow_type' or 'screening:<step>'; a token outside ARGV[1]'s
+# known set counts as the ERROR state, which some transitions allow.
+_TRANSITION_LUA = """
+local flow = redis.call('HGET', KEYS[1], 'flow_type')
+if not flow then return 0 end
+flow = cjson.decode(flow)
+local step = tonumber(redis.call('HGET', KEYS[1], 'current_step')) or 0
+local token = flow
+if flow == 'screening' then token = 'screening:' .. step end
+local known = cjson.decode(ARGV[1])
+local allowed = cjson.decode(ARGV[2])
+local ok = allowed[token]
+if not ok and ARGV[3] == '1' and not known[token] then ok = true end
+if not ok then return 0 end
+redis.call('HSET', KEYS[1],
+    'flow_type', ARGV[4],
+    'current_step', ARGV[5],
+    'last_active', ARGV[6])
+redis.call('EXPIRE', KEYS[1], ARGV[7])
+return 1
+"""
+
+_transition_script = redis_client.register_script(_TRANSITION_LUA) if USE_REDIS else None
 
 
 class SessionManager:
     """Session manager for handling user sessions and state"""
 
+    @staticmethod
+    def pipeline():
+        """Return a pipeline that mutators can share via their pipe argument.
+
+        Callers queue several mutations on one pipe and call execute() once,
+        turning N round trips into one. Returns None when running on the
+        in-memory fallback (mutations there apply immediately).
+        """
+        return redis_client.pipeline() if USE_REDIS else None
+
     @staticmethod
     def create_session() -> str:
         """Create a new session and return the session ID"""
-        session_id = str(uuid.uuid4())
+        # token_urlsafe is cheaper than uuid4's format-and-hyphenate path and
+        # yields a shorter key, trimming Redis key memory per session
+        session_id = secrets.token_urlsafe(16)
         session_data = {
             'id': session_id,
             'created_at': time.time(),
@@ -66,16 +191,21 @@ class SessionManager:
             'red_flags': [],
             'metadata': {}
         }
-        
+
         if USE_REDIS:
-            redis_client.setex(
-                f"session:{session_id}", 
-                SESSION_EXPIRY, 
-                json.dumps(session_data)
-            )
+            fields = {
+                key: orjson.dumps(value)
+                for key, value in session_data.items()
+                if key not in ('conversation_history', 'red_flags')
+            }
+            pipe = redis_client.pipeline()
+            pipe.hset(_session_key(session_id), mapping=fields)
+            pipe.expire(_session_key(session_id), SESSION_EXPIRY)
+            pipe.execute()
         else:
-            in_memory_sessions[session_id] = session_data
-            
+            with _fallback_lock:
+                in_memory_sessions[session_id] = session_data
+
         return session_id
 
     @staticmethod
@@ -83,92 +213,151 @@ class SessionManager:
         """Get session data by session ID"""
         if not session_id:
             return None
-            
+
         if USE_REDIS:
-            session_data = redis_client.get(f"session:{session_id}")
-            if session_data:
-                return json.loads(session_data)
+            with _session_cache_lock:
+                cached = _session_cache.get(session_id)
+            if cached is not None:
+                return cached
+            pipe = redis_client.pipeline()
+            pipe.hgetall(_session_key(session_id))
+            pipe.lrange(_history_key(session_id), 0, -1)
+            pipe.lrange(_red_flags_key(session_id), 0, -1)
+            fields, history, red_flags = pipe.execute()
+            if fields:
+                session_data = {key.decode(): orjson.loads(value) for key, value in fields.items()}
+                session_data['conversation_history'] = [orjson.loads(item) for item in history]
+                session_data['red_flags'] = [orjson.loads(item) for item in red_flags]
+                with _session_cache_lock:
+                    _session_cache[session_id] = session_data
+                return session_data
         else:
-            return in_memory_sessions.get(session_id)
-            
+            with _fallback_lock:
+                return in_memory_sessions.get(session_id)
+
         return None
 
     @staticmethod
-    def update_session(session_id: str, updates: Dict[str, Any]) -> bool:
-        """Update session with new data"""
-        session_data = SessionManager.get_session(session_id)
-        if not session_data:
-            print(f"[DEBUG] update_session: No session found for {session_id}")
+    def update_session(session_id: str, updates: Dict[str, Any], pipe=None) -> bool:
+        """Update session with new data
+
+        Only the changed fields are written; the session is never read back
+        or re-serialized as a whole. Pass a shared pipe to batch this with
+        other mutations; the caller then owns the execute().
+        """
+        if not session_id:
             return False
-        
-        # Update session data
-        session_data.update(updates)
-        session_data['last_active'] = time.time()
-        
-        # Ensure current_step is always present
-        if 'current_step' not in session_data:
-            session_data['current_step'] = 0
-        
-        # Debug print for flow_type and current_step
-        print(f"[DEBUG] update_session: session_id={session_id}, flow_type={session_data.get('flow_type')}, current_step={session_data.get('current_step')}, updates={updates}")
-        
+
+        updates = dict(updates)
+        updates['last_active'] = time.time()
+        _invalidate(session_id)
+
         if USE_REDIS:
-            redis_client.setex(
-                f"session:{session_id}", 
-                SESSION_EXPIRY, 
-                json.dumps(session_data)
-            )
+            # List-backed fields live in their own keys; replace those lists
+            # wholesale and write the rest as hash fields
+            history = updates.pop('conversation_history', None)
+            red_flags = updates.pop('red_flags', None)
+            fields = {key: orjson.dumps(value) for key, value in updates.items()}
+            p = pipe if pipe is not None else redis_client.pipeline()
+            p.hset(_session_key(session_id), mapping=fields)
+            if history is not None:
+                p.delete(_history_key(session_id))
+                if history:
+                    p.rpush(_history_key(session_id), *[orjson.dumps(m) for m in history])
+                    p.ltrim(_history_key(session_id), -MAX_HISTORY_MESSAGES, -1)
+                p.expire(_history_key(session_id), SESSION_EXPIRY)
+            if red_flags is not None:
+                p.delete(_red_flags_key(session_id))
+                if red_flags:
+                    p.rpush(_red_flags_key(session_id), *[orjson.dumps(rf) for rf in red_flags])
+                p.expire(_red_flags_key(session_id), SESSION_EXPIRY)
+            p.expire(_session_key(session_id), SESSION_EXPIRY)
+            if pipe is None:
+                p.execute()
         else:
-            in_memory_sessions[session_id] = session_data
-        
+            with _fallback_lock:
+                session_data = in_memory_sessions.get(session_id)
+                if not session_data:
+                    print(f"[DEBUG] update_session: No session found for {session_id}")
+                    return False
+                session_data.update(updates)
+                in_memory_sessions[session_id] = session_data  # refresh TTL
+
         return True
 
     @staticmethod
     def add_message_to_history(
-        session_id: str, 
-        role: str, 
+        session_id: str,
+        role: str,
         content: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        pipe=None
     ) -> bool:
-        """Add a message to the conversation history"""
-        session_data = SessionManager.get_session(session_id)
-        if not session_data:
+        """Add a message to the conversation history
+
+        One pipelined round trip: RPUSH the message, trim the list to the
+        newest MAX_HISTORY_MESSAGES, touch last_active, refresh the TTLs.
+        A shared pipe batches this with other mutations.
+        """
+        if not session_id:
             return False
-            
+
         message = {
             'role': role,
             'content': content,
             'timestamp': time.time()
         }
-        
+
         if metadata:
             message['metadata'] = metadata
-            
-        if 'conversation_history' not in session_data:
-            session_data['conversation_history'] = []
-            
-        session_data['conversation_history'].append(message)
-        session_data['last_active'] = time.time()
-        
+
+        _invalidate(session_id)
         if USE_REDIS:
-            redis_client.setex(
-                f"session:{session_id}", 
-                SESSION_EXPIRY, 
-                json.dumps(session_data)
-            )
+            p = pipe if pipe is not None else redis_client.pipeline()
+            p.rpush(_history_key(session_id), orjson.dumps(message))
+            p.ltrim(_history_key(session_id), -MAX_HISTORY_MESSAGES, -1)
+            p.hset(_session_key(session_id), 'last_active', orjson.dumps(time.time()))
+            p.expire(_session_key(session_id), SESSION_EXPIRY)
+            p.expire(_history_key(session_id), SESSION_EXPIRY)
+            if pipe is None:
+                p.execute()
         else:
-            in_memory_sessions[session_id] = session_data
-            
+            with _fallback_lock:
+                session_data = in_memory_sessions.get(session_id)
+                if not session_data:
+                    return False
+                history = session_data.setdefault('conversation_history', [])
+                history.append(message)
+                if len(history) > MAX_HISTORY_MESSAGES:
+                    del history[:-MAX_HISTORY_MESSAGES]
+                session_data['last_active'] = time.time()
+                in_memory_sessions[session_id] = session_data  # refresh TTL
+
         return True
 
     @staticmethod
-    def get_conversation_history(session_id: str) -> List[Dict[str, Any]]:
-        """Get the conversation history for a session"""
-        session_data = SessionManager.get_session(session_id)
+    def get_conversation_history(session_id: str, limit: int = 32) -> List[Dict[str, Any]]:
+        """Get the newest `limit` messages of a session's history
+
+        Backed by LRANGE on the history list, so only the requested tail is
+        transferred and decoded; pass limit=-1 for the full history.
+        """
+        if not session_id:
+            return []
+
+        start = 0 if limit == -1 else -limit
+        if USE_REDIS:
+            return [
+                orjson.loads(item)
+                for item in redis_client.lrange(_history_key(session_id), start, -1)
+            ]
+
+        with _fallback_lock:
+            session_data = in_memory_sessions.get(session_id)
         if not session_data:
             return []
-            
-        return session_data.get('conversation_history', [])
+        history = session_data.get('conversation_history', [])
+        return history if limit == -1 else history[start:]
 
     @staticmethod
     def set_flow_type(session_id: str, flow_type: str) -> bool:
@@ -178,91 +367,271 @@ class SessionManager:
             return False
         print(f"[DEBUG] set_flow_type: session_id={session_id}, new_flow_type={flow_type}")
         return SessionManager.update_session(
-            session_id, 
+            session_id,
             {'flow_type': flow_type, 'current_step': 0}
         )
 
     @staticmethod
     def advance_step(session_id: str) -> int:
         """Advance to the next step in the current flow and return the new step number"""
-        session_data = SessionManager.get_session(session_id)
-        if not session_data:
-            print(f"[DEBUG] advance_step: No session found for {session_id}")
+        if not session_id:
             return -1
-        
-        current_step = session_data.get('current_step', 0)
-        new_step = current_step + 1
-        print(f"[DEBUG] advance_step: session_id={session_id}, advancing from {current_step} to {new_step}")
-        
-        success = SessionManager.update_session(
-            session_id, 
-            {'current_step': new_step}
-        )
-        
-        return new_step if success else -1
+
+        _invalidate(session_id)
+        if USE_REDIS:
+            # Server-side increment; current_step is stored as a bare JSON
+            # integer so HINCRBY operates on it directly
+            pipe = redis_client.pipeline()
+            pipe.hincrby(_session_key(session_id), 'current_step', 1)
+            pipe.hset(_session_key(session_id), 'last_active', orjson.dumps(time.time()))
+            pipe.expire(_session_key(session_id), SESSION_EXPIRY)
+            new_step = pipe.execute()[0]
+            print(f"[DEBUG] advance_step: session_id={session_id}, advanced to {new_step}")
+            return new_step
+
+        with _fallback_lock:
+            session_data = in_memory_sessions.get(session_id)
+            if not session_data:
+                print(f"[DEBUG] advance_step: No session found for {session_id}")
+                return -1
+            new_step = session_data.get('current_step', 0) + 1
+            session_data['current_step'] = new_step
+            session_data['last_active'] = time.time()
+            in_memory_sessions[session_id] = session_data  # refresh TTL
+        print(f"[DEBUG] advance_step: session_id={session_id}, advanced to {new_step}")
+        return new_step
+
+    @staticmethod
+    def add_message_and_advance(
+        session_id: str,
+        role: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Append a message and advance the flow step in one round trip
+
+        Flows that record a system response and move to the next step paid
+        two separate Redis exchanges; this batches the append, trim,
+        HINCRBY and TTL refreshes into a single pipeline and returns the
+        new step number (-1 if the session id is missing).
+        """
+        if not session_id:
+            return -1
+
+        message = {
+            'role': role,
+            'content': content,
+            'timestamp': time.time()
+        }
+        if metadata:
+            message['metadata'] = metadata
+
+        _invalidate(session_id)
+        if USE_REDIS:
+            pipe = redis_client.pipeline()
+            pipe.rpush(_history_key(session_id), orjson.dumps(message))
+            pipe.ltrim(_history_key(session_id), -MAX_HISTORY_MESSAGES, -1)
+            pipe.hincrby(_session_key(session_id), 'current_step', 1)
+            pipe.hset(_session_key(session_id), 'last_active', orjson.dumps(time.time()))
+            pipe.expire(_session_key(session_id), SESSION_EXPIRY)
+            pipe.expire(_history_key(session_id), SESSION_EXPIRY)
+            return pipe.execute()[2]
+
+        with _fallback_lock:
+            session_data = in_memory_sessions.get(session_id)
+            if not session_data:
+                return -1
+            history = session_data.setdefault('conversation_history', [])
+            history.append(message)
+            if len(history) > MAX_HISTORY_MESSAGES:
+                del history[:-MAX_HISTORY_MESSAGES]
+            new_step = session_data.get('current_step', 0) + 1
+            session_data['current_step'] = new_step
+            session_data['last_active'] = time.time()
+            in_memory_sessions[session_id] = session_data  # refresh TTL
+        return new_step
+
+    @staticmethod
+    def get_flow_state(session_id: str) -> Optional[tuple]:
+        """Return (flow_type, current_step) without loading the full session
+
+        An HMGET of two hash fields - callers that only need to know where
+        the session is in the flow skip the history/red-flag list reads and
+        their per-message decodes entirely.
+        """
+        if not session_id:
+            return None
+
+        if USE_REDIS:
+            flow_type, current_step = redis_client.hmget(
+                _session_key(session_id), 'flow_type', 'current_step'
+            )
+            if flow_type is None:
+                return None
+            return (
+                orjson.loads(flow_type),
+                orjson.loads(current_step) if current_step is not None else 0
+            )
+
+        with _fallback_lock:
+            session_data = in_memory_sessions.get(session_id)
+        if not session_data:
+            return None
+        return session_data.get('flow_type'), session_data.get('current_step', 0)
+
+    @staticmethod
+    def transition_session(
+        session_id: str,
+        flow_type: str,
+        current_step: int,
+        allowed_tokens: List[str],
+        known_tokens: List[str],
+        allow_from_unknown: bool = False
+    ) -> bool:
+        """Atomically move a session to (flow_type, current_step).
+
+        The write only happens if the session's current state token is in
+        allowed_tokens (or is unknown while allow_from_unknown is set, which
+        models transitions out of the ERROR state). On Redis this runs as a
+        single Lua call; the fallback replicates the check under the lock.
+        """
+        if not session_id:
+            return False
+
+        _invalidate(session_id)
+        now = time.time()
+        if USE_REDIS:
+            result = _transition_script(
+                keys=[_session_key(session_id)],
+                args=[
+                    orjson.dumps({token: True for token in known_tokens}),
+                    orjson.dumps({token: True for token in allowed_tokens}),
+                    '1' if allow_from_unknown else '0',
+                    orjson.dumps(flow_type),
+                    current_step,
+                    now,
+                    SESSION_EXPIRY
+                ]
+            )
+            return bool(result)
+
+        with _fallback_lock:
+            session_data = in_memory_sessions.get(session_id)
+            if not session_data:
+                return False
+            current_flow = session_data.get('flow_type')
+            step = session_data.get('current_step', 0)
+            token = f"screening:{step}" if current_flow == 'screening' else current_flow
+            ok = token in allowed_tokens
+            if not ok and allow_from_unknown and token not in known_tokens:
+                ok = True
+            if not ok:
+                return False
+            session_data['flow_type'] = flow_type
+            session_data['current_step'] = current_step
+            session_data['last_active'] = now
+            in_memory_sessions[session_id] = session_data  # refresh TTL
+        return True
 
     @staticmethod
     def get_current_step(session_id: str) -> int:
         """Get the current step for a session"""
-        session_data = SessionManager.get_session(session_id)
+        if not session_id:
+            return -1
+
+        if USE_REDIS:
+            current_step = redis_client.hget(_session_key(session_id), 'current_step')
+            if current_step is None:
+                return -1
+            return orjson.loads(current_step)
+
+        with _fallback_lock:
+            session_data = in_memory_sessions.get(session_id)
         if not session_data:
             return -1
-            
         return session_data.get('current_step', 0)
 
     @staticmethod
-    def set_screening_data(session_id: str, condition: str, data: Dict[str, Any]) -> bool:
-        """Set screening data for a specific condition"""
-        session_data = SessionManager.get_session(session_id)
-        if not session_data:
+    def set_screening_data(
+        session_id: str,
+        condition: str,
+        data: Dict[str, Any],
+        session_data: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Set screening data for a specific condition
+
+        Callers that already loaded the session in the same request can pass
+        it as session_data to skip the read-back of the screening_data field.
+        """
+        if not session_id:
             return False
-            
-        if 'screening_data' not in session_data:
-            session_data['screening_data'] = {}
-            
-        session_data['screening_data'][condition] = data
-        
+
+        _invalidate(session_id)
         if USE_REDIS:
-            redis_client.setex(
-                f"session:{session_id}", 
-                SESSION_EXPIRY, 
-                json.dumps(session_data)
-            )
+            # screening_data stays one hash field keyed by condition, so
+            # only that field (not the whole session) is read and rewritten
+            if session_data is not None:
+                screening_data = dict(session_data.get('screening_data') or {})
+            else:
+                raw = redis_client.hget(_session_key(session_id), 'screening_data')
+                screening_data = orjson.loads(raw) if raw else {}
+            screening_data[condition] = data
+            pipe = redis_client.pipeline()
+            pipe.hset(_session_key(session_id), 'screening_data', orjson.dumps(screening_data))
+            pipe.hset(_session_key(session_id), 'last_active', orjson.dumps(time.time()))
+            pipe.expire(_session_key(session_id), SESSION_EXPIRY)
+            pipe.execute()
         else:
-            in_memory_sessions[session_id] = session_data
-            
+            with _fallback_lock:
+                session_data = in_memory_sessions.get(session_id)
+                if not session_data:
+                    return False
+                session_data.setdefault('screening_data', {})[condition] = data
+                session_data['last_active'] = time.time()
+                in_memory_sessions[session_id] = session_data  # refresh TTL
+
         return True
 
     @staticmethod
-    def add_red_flag(session_id: str, red_flag_data: Dict[str, Any]) -> bool:
+    def add_red_flag(session_id: str, red_flag_data: Dict[str, Any], pipe=None) -> bool:
         """Add a red flag to the session"""
-        session_data = SessionManager.get_session(session_id)
-        if not session_data:
+        if not session_id:
             return False
-            
-        if 'red_flags' not in session_data:
-            session_data['red_flags'] = []
-            
-        session_data['red_flags'].append(red_flag_data)
-        
+
+        _invalidate(session_id)
         if USE_REDIS:
-            redis_client.setex(
-                f"session:{session_id}", 
-                SESSION_EXPIRY, 
-                json.dumps(session_data)
-            )
+            p = pipe if pipe is not None else redis_client.pipeline()
+            p.rpush(_red_flags_key(session_id), orjson.dumps(red_flag_data))
+            p.hset(_session_key(session_id), 'last_active', orjson.dumps(time.time()))
+            p.expire(_session_key(session_id), SESSION_EXPIRY)
+            p.expire(_red_flags_key(session_id), SESSION_EXPIRY)
+            if pipe is None:
+                p.execute()
         else:
-            in_memory_sessions[session_id] = session_data
-            
+            with _fallback_lock:
+                session_data = in_memory_sessions.get(session_id)
+                if not session_data:
+                    return False
+                session_data.setdefault('red_flags', []).append(red_flag_data)
+                session_data['last_active'] = time.time()
+                in_memory_sessions[session_id] = session_data  # refresh TTL
+
         return True
 
     @staticmethod
     def delete_session(session_id: str) -> bool:
         """Delete a session"""
+        _invalidate(session_id)
         if USE_REDIS:
-            return bool(redis_client.delete(f"session:{session_id}"))
+            deleted = redis_client.delete(
+                _session_key(session_id),
+                _history_key(session_id),
+                _red_flags_key(session_id)
+            )
+            return bool(deleted)
         else:
-            if session_id in in_memory_sessions:
-                del in_memory_sessions[session_id]
-                return True
-            return False 
\ No newline at end of file
+            with _fallback_lock:
+                if session_id in in_memory_sessions:
+                    del in_memory_sessions[session_id]
+                    return True
+            return False
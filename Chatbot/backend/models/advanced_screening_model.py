@@ -3,301 +3,457 @@ Advanced Screening Model for Infant Health Conditions
 Incorporates sophisticated, data-driven logic with evidence-based scoring algorithms
 """
 
+import functools
 import re
+from bisect import bisect_left, bisect_right
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 import json
 
+import numpy as np
+
+# Numeric extraction patterns, compiled once at import. Each group's
+# alternatives are folded into a single alternation (specific phrasings
+# before their prefixes) so extraction is one scan per group instead of one
+# per phrasing, with no per-call re-cache lookups.
+# IGNORECASE instead of a .lower() per call spares one string copy per scan
+_RR_RE = re.compile(r"(\d+)\s*breaths?\s*per\s*minute|(\d+)\s*bpm|breathing\s*(\d+)\s*times|(\d+)\s*breaths", re.IGNORECASE)
+_AGE_RE = re.compile(r"(\d+)\s*days?\s*old|age\s*(\d+)\s*days|(\d+)\s*days?\s*of\s*age", re.IGNORECASE)
+_STOOL_RE = re.compile(r"(\d+)\s*stools?\s*per\s*day|(\d+)\s*times\s*per\s*day|(\d+)\s*bowel\s*movements", re.IGNORECASE)
+
+_WS_RE = re.compile(r"\s+")
+
+# Risk buckets in ascending order; bisecting a (low, medium, high)
+# threshold triple with a score yields the index into both tuples
+_LEVELS = ("minimal", "low", "medium", "high")
+_URGENCIES = ("monitor", "routine", "soon", "immediate")
+
+# Exact canonical phrasings of an unremarkable answer. Membership is
+# deliberately exact-match: a keyword-bearing phrase like 'no feeding'
+# must never be mistaken for normal
+_NORMAL_RESPONSES = frozenset({
+    "normal", "none", "no",
+    "normal breathing", "breathing normally",
+    "no chest indrawing", "no indrawing",
+    "no grunting",
+    "no cyanosis", "not blue",
+    "normal feeding", "feeding normally", "feeding well"
+})
+
+# Canonical stand-in for any all-normal screening; every such input maps to
+# this one memoized cache entry per age
+_NORMAL_KEY = (
+    "normal breathing", "no chest indrawing", "no grunting",
+    "no cyanosis", "normal feeding"
+)
+
+_NUMERIC_PATTERNS = (
+    ('respiratory_rate', _RR_RE),
+    ('age_days', _AGE_RE),
+    ('stool_frequency', _STOOL_RE)
+)
+
+def _build_weight_arrays(weights):
+    """Derive the numpy form of a weight table for the batch scorer.
+
+    Returns (symptom order, per-symptom severity index, weight matrix,
+    row index vector, total max weight). The matrix is indexed
+    [symptom, severity code] with unused severity slots padded with zeros;
+    the row vector is prebuilt so the batch gather never re-allocates an
+    arange per call.
+    """
+    symptoms = tuple(weights)
+    severity_index = {
+        symptom: {severity: code for code, severity in enumerate(weights[symptom])}
+        for symptom in symptoms
+    }
+    width = max(len(weights[symptom]) for symptom in symptoms)
+    matrix = np.zeros((len(symptoms), width), dtype=np.int16)
+    for row, symptom in enumerate(symptoms):
+        for severity, cfg in weights[symptom].items():
+            matrix[row, severity_index[symptom][severity]] = cfg["weight"]
+    rows = np.arange(len(symptoms))
+    return symptoms, severity_index, matrix, rows, int(matrix.max(axis=1).sum())
+
+def _compile_inline_scorer(weights):
+    """Generate a weight-sum function with the tables inlined as literals.
+
+    Partial evaluation at class build time: each symptom's weights become a
+    constant tuple indexed by severity code in the generated bytecode, so
+    the complete-classification fast path does no table lookups at all.
+    """
+    params = [f"c{i}" for i in range(len(weights))]
+    terms = []
+    for param, severities in zip(params, weights.values()):
+        weight_tuple = tuple(cfg["weight"] for cfg in severities.values())
+        terms.append(f"{weight_tuple!r}[{param}]")
+    source = "def _inline_score({}):\n    return {}\n".format(
+        ", ".join(params), " + ".join(terms)
+    )
+    namespace = {}
+    exec(compile(source, "<inline pneumonia scorer>", "exec"), namespace)
+    return namespace["_inline_score"]
+
+def _build_keyword_table(buckets, default):
+    """Compile severity buckets into one scan regex plus a rank table.
+
+    Matching must stay substring-based: responses arrive with punctuation
+    and inflections ("very fast!", "breathing rapidly"), so exact token
+    probes would silently downgrade severities. The alternation is wrapped
+    in a zero-width lookahead so every keyword is found at its own offset
+    even when keywords overlap ("fast" inside "slightly fast"), and the
+    alternatives are ordered worst rank first so the capture at any offset
+    is the worst keyword starting there. Ranks grow with severity, so the
+    worst matching keyword wins - the old worst-bucket-first ordering.
+    Returns (regex, table, severities) where severities[0] is the default
+    for no match.
+    """
+    table = {}
+    worst_rank = len(buckets)
+    for offset, (severity, words) in enumerate(buckets):
+        rank = worst_rank - offset
+        for word in words:
+            table.setdefault(word, rank)
+    ordered = sorted(table, key=lambda word: (-table[word], -len(word)))
+    regex = re.compile(r"(?=(" + "|".join(re.escape(word) for word in ordered) + r"))")
+    severities = (default,) + tuple(severity for severity, _ in reversed(buckets))
+    return regex, table, severities
+
 class AdvancedScreeningModel:
-    def __init__(self):
-        # Age-specific risk factors and thresholds
-        self.age_risk_factors = {
-            "neonatal": {"min_days": 0, "max_days": 28, "risk_multiplier": 1.5},
-            "young_infant": {"min_days": 29, "max_days": 90, "risk_multiplier": 1.3},
-            "older_infant": {"min_days": 91, "max_days": 365, "risk_multiplier": 1.0}
+    # Every table lives on the class, so instances carry no state at all;
+    # empty __slots__ drops the per-instance __dict__ entirely and keeps
+    # hot-path self.xxx lookups on the class-attribute fast path
+    __slots__ = ()
+
+    # All tables are static per process: defining them at class level means
+    # they are built once at import instead of per instance, and every
+    # AdvancedScreeningModel shares them
+    # Keyword tables for classifying free-text pneumonia responses: per
+    # symptom, every keyword/phrase mapped to a severity rank (worst rank
+    # wins) plus the default severity when nothing matches
+    _pneumonia_keywords = {
+        "respiratory_rate": _build_keyword_table([
+            ("very_high", ("very fast", "extremely fast", ">70", "70+")),
+            ("high", ("fast", "rapid", ">60", "60+")),
+            ("elevated", ("slightly fast", "elevated"))
+        ], "normal"),
+        "chest_indrawing": _build_keyword_table([
+            ("severe", ("severe", "very bad", "extreme", "terrible")),
+            ("moderate", ("moderate", "bad", "clearly visible")),
+            ("mild", ("mild", "slight", "a little"))
+        ], "none"),
+        "grunting": _build_keyword_table([
+            ("continuous", ("continuous", "all the time", "constantly")),
+            ("frequent", ("frequent", "often", "regularly")),
+            ("occasional", ("occasional", "sometimes", "now and then"))
+        ], "none"),
+        "cyanosis": _build_keyword_table([
+            ("severe", ("severe", "very blue", "extremely blue", "purple")),
+            ("mild", ("mild", "slightly blue", "bluish"))
+        ], "none"),
+        "feeding_status": _build_keyword_table([
+            ("refusing", ("refusing", "won't eat", "not eating", "no feeding")),
+            ("poor", ("poor", "bad", "very little")),
+            ("reduced", ("reduced", "less", "decreased"))
+        ], "normal")
+    }
+
+    # Age-specific risk factors and thresholds
+    age_risk_factors = {
+        "neonatal": {"min_days": 0, "max_days": 28, "risk_multiplier": 1.5},
+        "young_infant": {"min_days": 29, "max_days": 90, "risk_multiplier": 1.3},
+        "older_infant": {"min_days": 91, "max_days": 365, "risk_multiplier": 1.0}
+    }
+
+    # Sorted boundaries derived from age_risk_factors so age lookups are a
+    # bisect over three upper bounds instead of a linear scan of the dict
+    _age_bounds = tuple(factors["max_days"] for factors in age_risk_factors.values())
+    _age_groups = tuple(age_risk_factors)
+    _age_mults = tuple(factors["risk_multiplier"] for factors in age_risk_factors.values())
+    
+    # Evidence-based symptom weights for pneumonia/ARI
+    pneumonia_weights = {
+        "respiratory_rate": {
+            "normal": {"weight": 0, "description": "Normal respiratory rate"},
+            "elevated": {"weight": 15, "description": "Elevated respiratory rate"},
+            "high": {"weight": 25, "description": "High respiratory rate (>60/min)"},
+            "very_high": {"weight": 35, "description": "Very high respiratory rate (>70/min)"}
+        },
+        "chest_indrawing": {
+            "none": {"weight": 0, "description": "No chest indrawing"},
+            "mild": {"weight": 20, "description": "Mild chest indrawing"},
+            "moderate": {"weight": 30, "description": "Moderate chest indrawing"},
+            "severe": {"weight": 40, "description": "Severe chest indrawing"}
+        },
+        "grunting": {
+            "none": {"weight": 0, "description": "No grunting"},
+            "occasional": {"weight": 15, "description": "Occasional grunting"},
+            "frequent": {"weight": 25, "description": "Frequent grunting"},
+            "continuous": {"weight": 35, "description": "Continuous grunting"}
+        },
+        "cyanosis": {
+            "none": {"weight": 0, "description": "No cyanosis"},
+            "mild": {"weight": 30, "description": "Mild cyanosis"},
+            "severe": {"weight": 50, "description": "Severe cyanosis"}
+        },
+        "feeding_status": {
+            "normal": {"weight": 0, "description": "Normal feeding"},
+            "reduced": {"weight": 10, "description": "Reduced feeding"},
+            "poor": {"weight": 20, "description": "Poor feeding"},
+            "refusing": {"weight": 30, "description": "Refusing feeds"}
         }
-        
-        # Evidence-based symptom weights for pneumonia/ARI
-        self.pneumonia_weights = {
-            "respiratory_rate": {
-                "normal": {"weight": 0, "description": "Normal respiratory rate"},
-                "elevated": {"weight": 15, "description": "Elevated respiratory rate"},
-                "high": {"weight": 25, "description": "High respiratory rate (>60/min)"},
-                "very_high": {"weight": 35, "description": "Very high respiratory rate (>70/min)"}
-            },
-            "chest_indrawing": {
-                "none": {"weight": 0, "description": "No chest indrawing"},
-                "mild": {"weight": 20, "description": "Mild chest indrawing"},
-                "moderate": {"weight": 30, "description": "Moderate chest indrawing"},
-                "severe": {"weight": 40, "description": "Severe chest indrawing"}
+    }
+    
+    # Flat lookup forms of the pneumonia table for the scoring loop: one
+    # dict hop per weight and the per-symptom maxima precomputed, so
+    # scoring is plain integer adds. The verbose table above keeps the
+    # descriptions for reporting.
+    _pneumonia_weight = {
+        symptom: {severity: cfg["weight"] for severity, cfg in severities.items()}
+        for symptom, severities in pneumonia_weights.items()
+    }
+    _pneumonia_max = {
+        symptom: max(weights.values())
+        for symptom, weights in _pneumonia_weight.items()
+    }
+
+    # numpy form of the pneumonia table for the batch scorer
+    _np_weights = _build_weight_arrays(pneumonia_weights)
+
+    # Specialized weight sum for fully classified screenings, with the
+    # weight tuples baked into the generated function's constants
+    _inline_score = staticmethod(_compile_inline_scorer(pneumonia_weights))
+
+    # Evidence-based symptom weights and interactions; the pneumonia
+    # entry aliases the table above instead of duplicating ~40 nested
+    # dicts per instance
+    symptom_weights = {
+        "pneumonia_ari": pneumonia_weights,
+        "diarrhea": {
+            "stool_frequency": {
+                "normal": {"weight": 0, "description": "Normal stool frequency"},
+                "increased": {"weight": 10, "description": "Increased stool frequency"},
+                "high": {"weight": 20, "description": "High stool frequency (>8/day)"},
+                "very_high": {"weight": 30, "description": "Very high stool frequency (>10/day)"}
             },
-            "grunting": {
-                "none": {"weight": 0, "description": "No grunting"},
-                "occasional": {"weight": 15, "description": "Occasional grunting"},
-                "frequent": {"weight": 25, "description": "Frequent grunting"},
-                "continuous": {"weight": 35, "description": "Continuous grunting"}
+            "stool_consistency": {
+                "normal": {"weight": 0, "description": "Normal stool consistency"},
+                "loose": {"weight": 15, "description": "Loose stools"},
+                "watery": {"weight": 25, "description": "Watery stools"},
+                "very_watery": {"weight": 35, "description": "Very watery stools"}
             },
-            "cyanosis": {
-                "none": {"weight": 0, "description": "No cyanosis"},
-                "mild": {"weight": 30, "description": "Mild cyanosis"},
-                "severe": {"weight": 50, "description": "Severe cyanosis"}
+            "dehydration_signs": {
+                "none": {"weight": 0, "description": "No dehydration signs"},
+                "mild": {"weight": 20, "description": "Mild dehydration signs"},
+                "moderate": {"weight": 35, "description": "Moderate dehydration signs"},
+                "severe": {"weight": 50, "description": "Severe dehydration signs"}
             },
-            "feeding_status": {
-                "normal": {"weight": 0, "description": "Normal feeding"},
-                "reduced": {"weight": 10, "description": "Reduced feeding"},
-                "poor": {"weight": 20, "description": "Poor feeding"},
-                "refusing": {"weight": 30, "description": "Refusing feeds"}
+            "vomiting": {
+                "none": {"weight": 0, "description": "No vomiting"},
+                "occasional": {"weight": 10, "description": "Occasional vomiting"},
+                "frequent": {"weight": 20, "description": "Frequent vomiting"},
+                "continuous": {"weight": 30, "description": "Continuous vomiting"}
             }
-        }
-        
-        # Evidence-based symptom weights and interactions
-        self.symptom_weights = {
-            "pneumonia_ari": {
-                "respiratory_rate": {
-                    "normal": {"weight": 0, "description": "Normal respiratory rate"},
-                    "elevated": {"weight": 15, "description": "Elevated respiratory rate"},
-                    "high": {"weight": 25, "description": "High respiratory rate (>60/min)"},
-                    "very_high": {"weight": 35, "description": "Very high respiratory rate (>70/min)"}
-                },
-                "chest_indrawing": {
-                    "none": {"weight": 0, "description": "No chest indrawing"},
-                    "mild": {"weight": 20, "description": "Mild chest indrawing"},
-                    "moderate": {"weight": 30, "description": "Moderate chest indrawing"},
-                    "severe": {"weight": 40, "description": "Severe chest indrawing"}
-                },
-                "grunting": {
-                    "none": {"weight": 0, "description": "No grunting"},
-                    "occasional": {"weight": 15, "description": "Occasional grunting"},
-                    "frequent": {"weight": 25, "description": "Frequent grunting"},
-                    "continuous": {"weight": 35, "description": "Continuous grunting"}
-                },
-                "cyanosis": {
-                    "none": {"weight": 0, "description": "No cyanosis"},
-                    "mild": {"weight": 30, "description": "Mild cyanosis"},
-                    "severe": {"weight": 50, "description": "Severe cyanosis"}
-                },
-                "feeding_status": {
-                    "normal": {"weight": 0, "description": "Normal feeding"},
-                    "reduced": {"weight": 10, "description": "Reduced feeding"},
-                    "poor": {"weight": 20, "description": "Poor feeding"},
-                    "refusing": {"weight": 30, "description": "Refusing feeds"}
-                }
+        },
+        "malnutrition": {
+            "feeding_pattern": {
+                "normal": {"weight": 0, "description": "Normal feeding pattern"},
+                "reduced": {"weight": 15, "description": "Reduced feeding"},
+                "poor": {"weight": 25, "description": "Poor feeding"},
+                "refusing": {"weight": 35, "description": "Refusing feeds"}
             },
-            "diarrhea": {
-                "stool_frequency": {
-                    "normal": {"weight": 0, "description": "Normal stool frequency"},
-                    "increased": {"weight": 10, "description": "Increased stool frequency"},
-                    "high": {"weight": 20, "description": "High stool frequency (>8/day)"},
-                    "very_high": {"weight": 30, "description": "Very high stool frequency (>10/day)"}
-                },
-                "stool_consistency": {
-                    "normal": {"weight": 0, "description": "Normal stool consistency"},
-                    "loose": {"weight": 15, "description": "Loose stools"},
-                    "watery": {"weight": 25, "description": "Watery stools"},
-                    "very_watery": {"weight": 35, "description": "Very watery stools"}
-                },
-                "dehydration_signs": {
-                    "none": {"weight": 0, "description": "No dehydration signs"},
-                    "mild": {"weight": 20, "description": "Mild dehydration signs"},
-                    "moderate": {"weight": 35, "description": "Moderate dehydration signs"},
-                    "severe": {"weight": 50, "description": "Severe dehydration signs"}
-                },
-                "vomiting": {
-                    "none": {"weight": 0, "description": "No vomiting"},
-                    "occasional": {"weight": 10, "description": "Occasional vomiting"},
-                    "frequent": {"weight": 20, "description": "Frequent vomiting"},
-                    "continuous": {"weight": 30, "description": "Continuous vomiting"}
-                }
+            "weight_change": {
+                "gaining": {"weight": 0, "description": "Normal weight gain"},
+                "stable": {"weight": 10, "description": "Stable weight"},
+                "slow_gain": {"weight": 20, "description": "Slow weight gain"},
+                "losing": {"weight": 30, "description": "Weight loss"}
             },
-            "malnutrition": {
-                "feeding_pattern": {
-                    "normal": {"weight": 0, "description": "Normal feeding pattern"},
-                    "reduced": {"weight": 15, "description": "Reduced feeding"},
-                    "poor": {"weight": 25, "description": "Poor feeding"},
-                    "refusing": {"weight": 35, "description": "Refusing feeds"}
-                },
-                "weight_change": {
-                    "gaining": {"weight": 0, "description": "Normal weight gain"},
-                    "stable": {"weight": 10, "description": "Stable weight"},
-                    "slow_gain": {"weight": 20, "description": "Slow weight gain"},
-                    "losing": {"weight": 30, "description": "Weight loss"}
-                },
-                "activity_level": {
-                    "normal": {"weight": 0, "description": "Normal activity level"},
-                    "reduced": {"weight": 10, "description": "Reduced activity"},
-                    "lethargic": {"weight": 20, "description": "Lethargic"},
-                    "very_lethargic": {"weight": 30, "description": "Very lethargic"}
-                },
-                "visible_signs": {
-                    "none": {"weight": 0, "description": "No visible signs"},
-                    "mild": {"weight": 15, "description": "Mild visible signs"},
-                    "moderate": {"weight": 25, "description": "Moderate visible signs"},
-                    "severe": {"weight": 35, "description": "Severe visible signs"}
-                }
+            "activity_level": {
+                "normal": {"weight": 0, "description": "Normal activity level"},
+                "reduced": {"weight": 10, "description": "Reduced activity"},
+                "lethargic": {"weight": 20, "description": "Lethargic"},
+                "very_lethargic": {"weight": 30, "description": "Very lethargic"}
             },
-            "neonatal_sepsis": {
-                "temperature": {
-                    "normal": {"weight": 0, "description": "Normal temperature"},
-                    "elevated": {"weight": 20, "description": "Elevated temperature"},
-                    "high_fever": {"weight": 35, "description": "High fever (>38.5°C)"},
-                    "hypothermia": {"weight": 40, "description": "Hypothermia (<36°C)"}
-                },
-                "feeding_status": {
-                    "normal": {"weight": 0, "description": "Normal feeding"},
-                    "reduced": {"weight": 15, "description": "Reduced feeding"},
-                    "poor": {"weight": 25, "description": "Poor feeding"},
-                    "refusing": {"weight": 35, "description": "Refusing feeds"}
-                },
-                "consciousness": {
-                    "alert": {"weight": 0, "description": "Alert and responsive"},
-                    "drowsy": {"weight": 20, "description": "Drowsy"},
-                    "lethargic": {"weight": 30, "description": "Lethargic"},
-                    "unconscious": {"weight": 50, "description": "Unconscious"}
-                },
-                "irritability": {
-                    "normal": {"weight": 0, "description": "Normal behavior"},
-                    "irritable": {"weight": 15, "description": "Irritable"},
-                    "very_irritable": {"weight": 25, "description": "Very irritable"},
-                    "inconsolable": {"weight": 35, "description": "Inconsolable"}
-                }
-            },
-            "neonatal_jaundice": {
-                "jaundice_extent": {
-                    "none": {"weight": 0, "description": "No jaundice"},
-                    "face_only": {"weight": 10, "description": "Jaundice on face only"},
-                    "upper_body": {"weight": 20, "description": "Jaundice on upper body"},
-                    "full_body": {"weight": 30, "description": "Jaundice on full body"},
-                    "below_knees": {"weight": 40, "description": "Jaundice below knees"}
-                },
-                "age_days": {
-                    "0_3": {"weight": 0, "description": "0-3 days old"},
-                    "4_7": {"weight": 10, "description": "4-7 days old"},
-                    "8_14": {"weight": 20, "description": "8-14 days old"},
-                    "15_plus": {"weight": 30, "description": "15+ days old"}
-                },
-                "feeding_status": {
-                    "normal": {"weight": 0, "description": "Normal feeding"},
-                    "reduced": {"weight": 15, "description": "Reduced feeding"},
-                    "poor": {"weight": 25, "description": "Poor feeding"},
-                    "refusing": {"weight": 35, "description": "Refusing feeds"}
-                },
-                "stool_color": {
-                    "normal": {"weight": 0, "description": "Normal stool color"},
-                    "pale": {"weight": 20, "description": "Pale stool"},
-                    "white": {"weight": 30, "description": "White stool"},
-                    "clay_colored": {"weight": 35, "description": "Clay colored stool"}
-                }
+            "visible_signs": {
+                "none": {"weight": 0, "description": "No visible signs"},
+                "mild": {"weight": 15, "description": "Mild visible signs"},
+                "moderate": {"weight": 25, "description": "Moderate visible signs"},
+                "severe": {"weight": 35, "description": "Severe visible signs"}
             }
-        }
-        
-        # Symptom interaction multipliers
-        self.interaction_multipliers = {
-            "pneumonia_ari": {
-                "respiratory_rate_high + chest_indrawing_moderate": 1.3,
-                "respiratory_rate_very_high + cyanosis_mild": 1.5,
-                "chest_indrawing_severe + grunting_frequent": 1.4,
-                "feeding_refusing + respiratory_rate_high": 1.2
-            },
-            "diarrhea": {
-                "stool_frequency_very_high + dehydration_signs_moderate": 1.3,
-                "stool_consistency_very_watery + vomiting_frequent": 1.4,
-                "dehydration_signs_severe + feeding_refusing": 1.5
+        },
+        "neonatal_sepsis": {
+            "temperature": {
+                "normal": {"weight": 0, "description": "Normal temperature"},
+                "elevated": {"weight": 20, "description": "Elevated temperature"},
+                "high_fever": {"weight": 35, "description": "High fever (>38.5°C)"},
+                "hypothermia": {"weight": 40, "description": "Hypothermia (<36°C)"}
             },
-            "malnutrition": {
-                "feeding_refusing + weight_losing": 1.4,
-                "activity_very_lethargic + visible_signs_severe": 1.3,
-                "feeding_poor + weight_slow_gain": 1.2
+            "feeding_status": {
+                "normal": {"weight": 0, "description": "Normal feeding"},
+                "reduced": {"weight": 15, "description": "Reduced feeding"},
+                "poor": {"weight": 25, "description": "Poor feeding"},
+                "refusing": {"weight": 35, "description": "Refusing feeds"}
             },
-            "neonatal_sepsis": {
-                "temperature_high_fever + consciousness_lethargic": 1.4,
-                "feeding_refusing + irritability_inconsolable": 1.3,
-                "consciousness_unconscious + temperature_hypothermia": 1.6
+            "consciousness": {
+                "alert": {"weight": 0, "description": "Alert and responsive"},
+                "drowsy": {"weight": 20, "description": "Drowsy"},
+                "lethargic": {"weight": 30, "description": "Lethargic"},
+                "unconscious": {"weight": 50, "description": "Unconscious"}
             },
-            "neonatal_jaundice": {
-                "jaundice_extent_below_knees + age_days_15_plus": 1.4,
-                "feeding_refusing + stool_color_white": 1.5,
-                "jaundice_extent_full_body + age_days_8_14": 1.3
+            "irritability": {
+                "normal": {"weight": 0, "description": "Normal behavior"},
+                "irritable": {"weight": 15, "description": "Irritable"},
+                "very_irritable": {"weight": 25, "description": "Very irritable"},
+                "inconsolable": {"weight": 35, "description": "Inconsolable"}
             }
-        }
-        
-        # Dynamic thresholds based on age and condition
-        self.dynamic_thresholds = {
-            "pneumonia_ari": {
-                "neonatal": {"low": 30, "medium": 50, "high": 70},
-                "young_infant": {"low": 25, "medium": 45, "high": 65},
-                "older_infant": {"low": 20, "medium": 40, "high": 60}
-            },
-            "diarrhea": {
-                "neonatal": {"low": 25, "medium": 45, "high": 65},
-                "young_infant": {"low": 20, "medium": 40, "high": 60},
-                "older_infant": {"low": 15, "medium": 35, "high": 55}
+        },
+        "neonatal_jaundice": {
+            "jaundice_extent": {
+                "none": {"weight": 0, "description": "No jaundice"},
+                "face_only": {"weight": 10, "description": "Jaundice on face only"},
+                "upper_body": {"weight": 20, "description": "Jaundice on upper body"},
+                "full_body": {"weight": 30, "description": "Jaundice on full body"},
+                "below_knees": {"weight": 40, "description": "Jaundice below knees"}
             },
-            "malnutrition": {
-                "neonatal": {"low": 20, "medium": 40, "high": 60},
-                "young_infant": {"low": 25, "medium": 45, "high": 65},
-                "older_infant": {"low": 30, "medium": 50, "high": 70}
+            "age_days": {
+                "0_3": {"weight": 0, "description": "0-3 days old"},
+                "4_7": {"weight": 10, "description": "4-7 days old"},
+                "8_14": {"weight": 20, "description": "8-14 days old"},
+                "15_plus": {"weight": 30, "description": "15+ days old"}
             },
-            "neonatal_sepsis": {
-                "neonatal": {"low": 15, "medium": 35, "high": 55},
-                "young_infant": {"low": 20, "medium": 40, "high": 60},
-                "older_infant": {"low": 25, "medium": 45, "high": 65}
+            "feeding_status": {
+                "normal": {"weight": 0, "description": "Normal feeding"},
+                "reduced": {"weight": 15, "description": "Reduced feeding"},
+                "poor": {"weight": 25, "description": "Poor feeding"},
+                "refusing": {"weight": 35, "description": "Refusing feeds"}
             },
-            "neonatal_jaundice": {
-                "neonatal": {"low": 20, "medium": 40, "high": 60},
-                "young_infant": {"low": 25, "medium": 45, "high": 65},
-                "older_infant": {"low": 30, "medium": 50, "high": 70}
+            "stool_color": {
+                "normal": {"weight": 0, "description": "Normal stool color"},
+                "pale": {"weight": 20, "description": "Pale stool"},
+                "white": {"weight": 30, "description": "White stool"},
+                "clay_colored": {"weight": 35, "description": "Clay colored stool"}
             }
         }
+    }
+    
+    # Symptom interaction multipliers
+    interaction_multipliers = {
+        "pneumonia_ari": {
+            "respiratory_rate_high + chest_indrawing_moderate": 1.3,
+            "respiratory_rate_very_high + cyanosis_mild": 1.5,
+            "chest_indrawing_severe + grunting_frequent": 1.4,
+            "feeding_refusing + respiratory_rate_high": 1.2
+        },
+        "diarrhea": {
+            "stool_frequency_very_high + dehydration_signs_moderate": 1.3,
+            "stool_consistency_very_watery + vomiting_frequent": 1.4,
+            "dehydration_signs_severe + feeding_refusing": 1.5
+        },
+        "malnutrition": {
+            "feeding_refusing + weight_losing": 1.4,
+            "activity_very_lethargic + visible_signs_severe": 1.3,
+            "feeding_poor + weight_slow_gain": 1.2
+        },
+        "neonatal_sepsis": {
+            "temperature_high_fever + consciousness_lethargic": 1.4,
+            "feeding_refusing + irritability_inconsolable": 1.3,
+            "consciousness_unconscious + temperature_hypothermia": 1.6
+        },
+        "neonatal_jaundice": {
+            "jaundice_extent_below_knees + age_days_15_plus": 1.4,
+            "feeding_refusing + stool_color_white": 1.5,
+            "jaundice_extent_full_body + age_days_8_14": 1.3
+        }
+    }
     
-    def extract_numerical_values(self, text: str) -> Dict[str, float]:
-        """Extract numerical values from text responses."""
+    # Dynamic thresholds based on age and condition
+    dynamic_thresholds = {
+        "pneumonia_ari": {
+            "neonatal": {"low": 30, "medium": 50, "high": 70},
+            "young_infant": {"low": 25, "medium": 45, "high": 65},
+            "older_infant": {"low": 20, "medium": 40, "high": 60}
+        },
+        "diarrhea": {
+            "neonatal": {"low": 25, "medium": 45, "high": 65},
+            "young_infant": {"low": 20, "medium": 40, "high": 60},
+            "older_infant": {"low": 15, "medium": 35, "high": 55}
+        },
+        "malnutrition": {
+            "neonatal": {"low": 20, "medium": 40, "high": 60},
+            "young_infant": {"low": 25, "medium": 45, "high": 65},
+            "older_infant": {"low": 30, "medium": 50, "high": 70}
+        },
+        "neonatal_sepsis": {
+            "neonatal": {"low": 15, "medium": 35, "high": 55},
+            "young_infant": {"low": 20, "medium": 40, "high": 60},
+            "older_infant": {"low": 25, "medium": 45, "high": 65}
+        },
+        "neonatal_jaundice": {
+            "neonatal": {"low": 20, "medium": 40, "high": 60},
+            "young_infant": {"low": 25, "medium": 45, "high": 65},
+            "older_infant": {"low": 30, "medium": 50, "high": 70}
+        }
+    }
+
+    # Threshold triples (low, medium, high) per condition and age group;
+    # risk bucketing bisects these instead of three keyed compares
+    _threshold_tuples = {
+        condition: {
+            group: (t["low"], t["medium"], t["high"]) for group, t in groups.items()
+        }
+        for condition, groups in dynamic_thresholds.items()
+    }
+
+    def extract_numerical_values(self, text: str, keys: Optional[Tuple[str, ...]] = None) -> Dict[str, float]:
+        """Extract numerical values from text responses.
+
+        keys restricts extraction to the named quantities so callers that
+        only consume some of them skip the other patterns' scans.
+        """
         values = {}
-        
-        # Extract respiratory rate
-        rr_patterns = [
-            r'(\d+)\s*breaths?\s*per\s*minute',
-            r'(\d+)\s*bpm',
-            r'breathing\s*(\d+)\s*times',
-            r'(\d+)\s*breaths'
-        ]
-        for pattern in rr_patterns:
-            match = re.search(pattern, text.lower())
-            if match:
-                values['respiratory_rate'] = float(match.group(1))
-                break
-        
-        # Extract age in days
-        age_patterns = [
-            r'(\d+)\s*days?\s*old',
-            r'age\s*(\d+)\s*days',
-            r'(\d+)\s*days?\s*of\s*age'
-        ]
-        for pattern in age_patterns:
-            match = re.search(pattern, text.lower())
-            if match:
-                values['age_days'] = float(match.group(1))
-                break
-        
-        # Extract stool frequency
-        stool_patterns = [
-            r'(\d+)\s*stools?\s*per\s*day',
-            r'(\d+)\s*times\s*per\s*day',
-            r'(\d+)\s*bowel\s*movements'
-        ]
-        for pattern in stool_patterns:
-            match = re.search(pattern, text.lower())
+
+        for key, pattern in _NUMERIC_PATTERNS:
+            if keys is not None and key not in keys:
+                continue
+            match = pattern.search(text)
             if match:
-                values['stool_frequency'] = float(match.group(1))
-                break
-        
+                # The alternation has one capture group per phrasing; take
+                # whichever one matched
+                values[key] = float(next(g for g in match.groups() if g))
+
         return values
-    
+
+    def _classify_response(self, symptom: str, response_lc: str) -> str:
+        """Classify a lowercased response via the symptom's keyword scan."""
+        regex, table, severities = self._pneumonia_keywords[symptom]
+        worst = len(severities) - 1
+        best = 0
+        for match in regex.finditer(response_lc):
+            rank = table[match.group(1)]
+            if rank > best:
+                best = rank
+                if best == worst:
+                    break
+        return severities[best]
+
     def classify_pneumonia_symptoms(self, responses: List[str], numerical_values: Dict[str, float]) -> Dict[str, str]:
-        """Classify pneumonia symptoms based on responses."""
+        """Classify pneumonia symptoms based on responses.
+
+        The scoring entry points hand in responses already lowercased by
+        their canonicalization pass, so no copies are made here for them;
+        mixed-case input from direct callers is lowered per response.
+        """
         symptom_scores = {}
-        
+
         if len(responses) >= 5:
-            # Respiratory rate
+            # The scoring entry points lowercase responses once at the
+            # boundary; only copy here if a caller passed raw text
+            resp_lc = [
+                response if response.islower() else response.lower()
+                for response in responses[:5]
+            ]
+
+            # Respiratory rate: prefer the extracted number, fall back to keywords
             rr = numerical_values.get('respiratory_rate')
             if rr:
                 if rr > 70:
@@ -309,114 +465,113 @@ class AdvancedScreeningModel:
                 else:
                     symptom_scores["respiratory_rate"] = "normal"
             else:
-                response = responses[0].lower()
-                if any(word in response for word in ["very fast", "extremely fast", ">70", "70+"]):
-                    symptom_scores["respiratory_rate"] = "very_high"
-                elif any(word in response for word in ["fast", "rapid", ">60", "60+"]):
-                    symptom_scores["respiratory_rate"] = "high"
-                elif any(word in response for word in ["slightly fast", "elevated"]):
-                    symptom_scores["respiratory_rate"] = "elevated"
-                else:
-                    symptom_scores["respiratory_rate"] = "normal"
-            
-            # Chest indrawing
-            response = responses[1].lower()
-            if any(word in response for word in ["severe", "very bad", "extreme", "terrible"]):
-                symptom_scores["chest_indrawing"] = "severe"
-            elif any(word in response for word in ["moderate", "bad", "clearly visible"]):
-                symptom_scores["chest_indrawing"] = "moderate"
-            elif any(word in response for word in ["mild", "slight", "a little"]):
-                symptom_scores["chest_indrawing"] = "mild"
-            else:
-                symptom_scores["chest_indrawing"] = "none"
-            
-            # Grunting
-            response = responses[2].lower()
-            if any(word in response for word in ["continuous", "all the time", "constantly"]):
-                symptom_scores["grunting"] = "continuous"
-            elif any(word in response for word in ["frequent", "often", "regularly"]):
-                symptom_scores["grunting"] = "frequent"
-            elif any(word in response for word in ["occasional", "sometimes", "now and then"]):
-                symptom_scores["grunting"] = "occasional"
-            else:
-                symptom_scores["grunting"] = "none"
-            
-            # Cyanosis
-            response = responses[3].lower()
-            if any(word in response for word in ["severe", "very blue", "extremely blue", "purple"]):
-                symptom_scores["cyanosis"] = "severe"
-            elif any(word in response for word in ["mild", "slightly blue", "bluish"]):
-                symptom_scores["cyanosis"] = "mild"
-            else:
-                symptom_scores["cyanosis"] = "none"
-            
-            # Feeding status
-            response = responses[4].lower()
-            if any(word in response for word in ["refusing", "won't eat", "not eating", "no feeding"]):
-                symptom_scores["feeding_status"] = "refusing"
-            elif any(word in response for word in ["poor", "bad", "very little"]):
-                symptom_scores["feeding_status"] = "poor"
-            elif any(word in response for word in ["reduced", "less", "decreased"]):
-                symptom_scores["feeding_status"] = "reduced"
-            else:
-                symptom_scores["feeding_status"] = "normal"
-        
+                symptom_scores["respiratory_rate"] = self._classify_response("respiratory_rate", resp_lc[0])
+
+            symptom_scores["chest_indrawing"] = self._classify_response("chest_indrawing", resp_lc[1])
+            symptom_scores["grunting"] = self._classify_response("grunting", resp_lc[2])
+            symptom_scores["cyanosis"] = self._classify_response("cyanosis", resp_lc[3])
+            symptom_scores["feeding_status"] = self._classify_response("feeding_status", resp_lc[4])
+
         return symptom_scores
     
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _age_group_and_mult(age_days: int) -> Tuple[str, float]:
+        """Resolve the age group and its risk multiplier for an age in days.
+
+        Shared by the multiplier and threshold lookups; the small cache
+        turns repeat ages into a dict hit.
+        """
+        cls = AdvancedScreeningModel
+        if 0 <= age_days <= cls._age_bounds[-1]:
+            index = bisect_left(cls._age_bounds, age_days)
+            return cls._age_groups[index], cls._age_mults[index]
+        return "older_infant", 1.0
+
     def calculate_age_risk_multiplier(self, age_days: float) -> float:
         """Calculate age-based risk multiplier."""
-        for age_group, factors in self.age_risk_factors.items():
-            if factors["min_days"] <= age_days <= factors["max_days"]:
-                return factors["risk_multiplier"]
-        return 1.0  # Default for older infants
+        return self._age_group_and_mult(int(age_days))[1]
     
     def calculate_interaction_multiplier(self, symptom_scores: Dict[str, str]) -> float:
-        """Calculate interaction multiplier based on symptom combinations."""
+        """Calculate interaction multiplier based on symptom combinations.
+
+        Severities are mapped to their integer codes (codes grow with
+        severity) so each interaction is two integer compares instead of
+        membership tests over small string lists - the same rank logic the
+        batch scorer applies across whole arrays.
+        """
+        index = self._np_weights[1]
+        rr = index["respiratory_rate"].get(symptom_scores.get("respiratory_rate"), 0)
+        ci = index["chest_indrawing"].get(symptom_scores.get("chest_indrawing"), 0)
+        gr = index["grunting"].get(symptom_scores.get("grunting"), 0)
+        cy = index["cyanosis"].get(symptom_scores.get("cyanosis"), 0)
+        fs = index["feeding_status"].get(symptom_scores.get("feeding_status"), 0)
+
         multiplier = 1.0
-        
-        # High respiratory rate + chest indrawing
-        if (symptom_scores.get("respiratory_rate") in ["high", "very_high"] and 
-            symptom_scores.get("chest_indrawing") in ["moderate", "severe"]):
+        if rr >= 2 and ci >= 2:      # high+ respiratory rate with moderate+ indrawing
             multiplier *= 1.3
-        
-        # Very high respiratory rate + cyanosis
-        if (symptom_scores.get("respiratory_rate") == "very_high" and 
-            symptom_scores.get("cyanosis") in ["mild", "severe"]):
+        if rr == 3 and cy >= 1:      # very high respiratory rate with any cyanosis
             multiplier *= 1.5
-        
-        # Severe chest indrawing + frequent grunting
-        if (symptom_scores.get("chest_indrawing") == "severe" and 
-            symptom_scores.get("grunting") in ["frequent", "continuous"]):
+        if ci == 3 and gr >= 2:      # severe indrawing with frequent+ grunting
             multiplier *= 1.4
-        
-        # Refusing feeds + high respiratory rate
-        if (symptom_scores.get("feeding_status") == "refusing" and 
-            symptom_scores.get("respiratory_rate") in ["high", "very_high"]):
+        if fs == 3 and rr >= 2:      # refusing feeds with high+ respiratory rate
             multiplier *= 1.2
-        
         return multiplier
     
     def calculate_advanced_pneumonia_score(self, responses: List[str], age_days: Optional[float] = None) -> Dict:
-        """Calculate advanced pneumonia screening score."""
-        numerical_values = {}
-        for response in responses:
-            numerical_values.update(self.extract_numerical_values(response))
+        """Calculate advanced pneumonia screening score.
+
+        Screening answers repeat heavily across sessions (the canonical
+        phrasings of the question prompts), so the pipeline is memoized on
+        the whitespace-collapsed, lowercased responses plus the integer
+        age. Repeat inputs become a cache hit instead of a full extraction,
+        classification and scoring pass.
+        """
+        canonical = tuple(
+            _WS_RE.sub(" ", response.strip().lower()) for response in responses
+        )
+        age_bucket = int(age_days) if age_days else 0
+        # Well-baby screenings dominate; collapse every all-normal answer
+        # set onto one canonical key so they share a single cache entry
+        # per age and never re-run the pipeline
+        if len(canonical) >= 5 and all(r in _NORMAL_RESPONSES for r in canonical):
+            canonical = _NORMAL_KEY
+        # Copy the top level and the nested recommendations so callers can
+        # annotate the result without poisoning the cached entry, whose
+        # recommendations dict is shared by every hit
+        result = dict(self._score_cached(canonical, age_bucket))
+        result["recommendations"] = dict(result["recommendations"])
+        return result
+
+    @functools.lru_cache(maxsize=4096)
+    def _score_cached(self, responses: Tuple[str, ...], age_bucket: int) -> Dict:
+        """Uncached scoring pipeline; age_bucket 0 means age unknown."""
+        age_days = age_bucket or None
+        # One pass over the joined responses, and only for the respiratory
+        # rate - the sole extracted quantity pneumonia scoring consumes
+        numerical_values = self.extract_numerical_values(
+            "\n".join(responses), keys=('respiratory_rate',)
+        )
         
         # Classify symptoms
         symptom_scores = self.classify_pneumonia_symptoms(responses, numerical_values)
         
-        # Calculate base weight
-        total_weight = 0
-        max_possible_weight = 0
-        
-        for symptom, severity in symptom_scores.items():
-            if symptom in self.pneumonia_weights:
-                weight = self.pneumonia_weights[symptom].get(severity, {"weight": 0})["weight"]
-                total_weight += weight
-                max_possible_weight += max(
-                    self.pneumonia_weights[symptom][s]["weight"] 
-                    for s in self.pneumonia_weights[symptom]
-                )
+        # Calculate base weight; a full classification takes the inlined
+        # fast path, partial ones fall back to the table walk
+        symptoms, severity_index, _, _, max_weight = self._np_weights
+        if len(symptom_scores) == len(symptoms):
+            total_weight = self._inline_score(
+                *(severity_index[symptom][symptom_scores[symptom]] for symptom in symptoms)
+            )
+            max_possible_weight = max_weight
+        else:
+            total_weight = 0
+            max_possible_weight = 0
+            for symptom, severity in symptom_scores.items():
+                weights = self._pneumonia_weight.get(symptom)
+                if weights is not None:
+                    total_weight += weights.get(severity, 0)
+                    max_possible_weight += self._pneumonia_max[symptom]
         
         # Apply age risk multiplier
         age_multiplier = self.calculate_age_risk_multiplier(age_days or 30)
@@ -433,30 +588,17 @@ class AdvancedScreeningModel:
             percentage_score = 0
         
         # Determine age group for threshold comparison
-        age_group = "older_infant"  # Default
         if age_days:
-            for group, factors in self.age_risk_factors.items():
-                if factors["min_days"] <= age_days <= factors["max_days"]:
-                    age_group = group
-                    break
+            age_group = self._age_group_and_mult(int(age_days))[0]
+        else:
+            age_group = "older_infant"
         
-        # Get thresholds
+        # Bucket the score against the age group's thresholds
+        bucket = bisect_right(self._threshold_tuples["pneumonia_ari"][age_group], percentage_score)
+        risk_level = _LEVELS[bucket]
+        urgency = _URGENCIES[bucket]
         thresholds = self.dynamic_thresholds["pneumonia_ari"][age_group]
         
-        # Determine risk level
-        if percentage_score >= thresholds["high"]:
-            risk_level = "high"
-            urgency = "immediate"
-        elif percentage_score >= thresholds["medium"]:
-            risk_level = "medium"
-            urgency = "soon"
-        elif percentage_score >= thresholds["low"]:
-            risk_level = "low"
-            urgency = "routine"
-        else:
-            risk_level = "minimal"
-            urgency = "monitor"
-        
         return {
             "condition": "pneumonia_ari",
             "percentage_score": round(percentage_score, 1),
@@ -470,57 +612,156 @@ class AdvancedScreeningModel:
             "recommendations": self.get_pneumonia_recommendations(risk_level, urgency, age_days)
         }
     
-    def get_pneumonia_recommendations(self, risk_level: str, urgency: str, age_days: Optional[float]) -> Dict:
-        """Get pneumonia-specific recommendations."""
-        recommendations = {
+    def calculate_pneumonia_scores_batch(self, batch: List[List[str]], ages: Optional[List[Optional[float]]] = None) -> List[Dict]:
+        """Score many response sets in one vectorized pass.
+
+        Classification stays per-row (it is string work), but the weight
+        sums, age/interaction multipliers and percentages run as numpy
+        array arithmetic over int8 severity codes - one pass for the whole
+        batch instead of the per-call Python loops. Rows without the full
+        five responses fall back to the scalar path.
+        """
+        if ages is None:
+            ages = [None] * len(batch)
+
+        symptoms, severity_index, matrix, rows, max_weight = self._np_weights
+        results: List[Optional[Dict]] = [None] * len(batch)
+        codes_rows = []
+        scores_rows = []
+        vector_rows = []
+        for row, (responses, age_days) in enumerate(zip(batch, ages)):
+            responses = [
+                _WS_RE.sub(" ", response.strip().lower()) for response in responses
+            ]
+            numerical_values = self.extract_numerical_values(
+                "\n".join(responses), keys=('respiratory_rate',)
+            )
+            symptom_scores = self.classify_pneumonia_symptoms(responses, numerical_values)
+            if len(symptom_scores) != len(symptoms):
+                results[row] = self.calculate_advanced_pneumonia_score(responses, age_days)
+                continue
+            codes_rows.append([
+                severity_index[symptom][symptom_scores[symptom]] for symptom in symptoms
+            ])
+            scores_rows.append(symptom_scores)
+            vector_rows.append(row)
+
+        if codes_rows:
+            codes = np.asarray(codes_rows, dtype=np.int8)
+            age_arr = np.asarray(
+                [int(ages[row]) if ages[row] else 30 for row in vector_rows], dtype=np.int32
+            )
+            totals = matrix[rows, codes].sum(axis=1)
+            age_mults = np.select(
+                [age_arr <= bound for bound in self._age_bounds],
+                self._age_mults,
+                default=1.0
+            )
+            # Interaction multipliers as integer comparisons on the code
+            # columns (codes grow with severity), mirroring
+            # calculate_interaction_multiplier
+            rr, ci, gr, cy, fs = (codes[:, i] for i in range(5))
+            imults = (
+                np.where((rr >= 2) & (ci >= 2), 1.3, 1.0)
+                * np.where((rr == 3) & (cy >= 1), 1.5, 1.0)
+                * np.where((ci == 3) & (gr >= 2), 1.4, 1.0)
+                * np.where((fs == 3) & (rr >= 2), 1.2, 1.0)
+            )
+            percentages = totals * age_mults * imults / max_weight * 100
+
+            for pos, row in enumerate(vector_rows):
+                age_days = ages[row]
+                if age_days:
+                    age_group = self._age_group_and_mult(int(age_days))[0]
+                else:
+                    age_group = "older_infant"
+                percentage_score = float(percentages[pos])
+                bucket = bisect_right(self._threshold_tuples["pneumonia_ari"][age_group], percentage_score)
+                risk_level = _LEVELS[bucket]
+                urgency = _URGENCIES[bucket]
+                thresholds = self.dynamic_thresholds["pneumonia_ari"][age_group]
+                results[row] = {
+                    "condition": "pneumonia_ari",
+                    "percentage_score": round(percentage_score, 1),
+                    "risk_level": risk_level,
+                    "urgency": urgency,
+                    "age_multiplier": float(age_mults[pos]),
+                    "interaction_multiplier": float(imults[pos]),
+                    "symptom_scores": scores_rows[pos],
+                    "thresholds_used": thresholds,
+                    "age_group": age_group,
+                    "recommendations": self.get_pneumonia_recommendations(risk_level, urgency, age_days)
+                }
+
+        return results
+
+    # Recommendation payloads pre-merged with the algorithm metadata, built
+    # once per process; get_pneumonia_recommendations used to rebuild the
+    # whole four-entry table and copy the selected entry on every call
+    _pneumonia_recs = {
+        urgency: {
+            **base,
+            "monitoring": "Monitor breathing rate and effort",
+            "warning_signs": "Increased breathing difficulty, blue lips, refusal to feed",
+            "comfort_measures": "Keep upright position, humidified air if available",
+            "evidence_based": True,
+            "algorithm_version": "2.0"
+        }
+        for urgency, base in {
             "immediate": {
                 "action": "Seek immediate medical attention",
                 "timeframe": "Within 1-2 hours",
-                "priority": "Emergency",
-                "monitoring": "Monitor breathing rate and effort",
-                "warning_signs": "Increased breathing difficulty, blue lips, refusal to feed",
-                "comfort_measures": "Keep upright position, humidified air if available"
+                "priority": "Emergency"
             },
             "soon": {
                 "action": "Consult pediatrician soon",
                 "timeframe": "Within 24 hours",
-                "priority": "High",
-                "monitoring": "Monitor breathing rate and effort",
-                "warning_signs": "Increased breathing difficulty, blue lips, refusal to feed",
-                "comfort_measures": "Keep upright position, humidified air if available"
+                "priority": "High"
             },
             "routine": {
                 "action": "Schedule routine check-up",
                 "timeframe": "Within 1 week",
-                "priority": "Medium",
-                "monitoring": "Monitor breathing rate and effort",
-                "warning_signs": "Increased breathing difficulty, blue lips, refusal to feed",
-                "comfort_measures": "Keep upright position, humidified air if available"
+                "priority": "Medium"
             },
             "monitor": {
                 "action": "Monitor symptoms",
                 "timeframe": "Continue monitoring",
-                "priority": "Low",
-                "monitoring": "Monitor breathing rate and effort",
-                "warning_signs": "Increased breathing difficulty, blue lips, refusal to feed",
-                "comfort_measures": "Keep upright position, humidified air if available"
+                "priority": "Low"
             }
-        }
-        
-        base_recommendation = recommendations[urgency]
-        
-        return {
-            **base_recommendation,
-            "evidence_based": True,
-            "algorithm_version": "2.0"
-        }
+        }.items()
+    }
+
+    def get_pneumonia_recommendations(self, risk_level: str, urgency: str, age_days: Optional[float]) -> Dict:
+        """Get pneumonia-specific recommendations.
 
-# Global instance
-advanced_screening_model = AdvancedScreeningModel()
+        Returns a copy of the pre-baked entry; these land in screening
+        results that callers mutate, and handing out the class-level dict
+        would let that mutation corrupt every later screening.
+        """
+        return dict(self._pneumonia_recs[urgency])
+
+# Global instance, created lazily on first use (PEP 562) so importing the
+# module for its helpers does not pay for instantiation
+_instance = None
+
+def _get_model() -> AdvancedScreeningModel:
+    global _instance
+    if _instance is None:
+        _instance = AdvancedScreeningModel()
+    return _instance
+
+def __getattr__(name):
+    if name == "advanced_screening_model":
+        return _get_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def run_advanced_pneumonia_screening(responses: List[str], age_days: Optional[float] = None) -> Dict:
     """Main function to run advanced pneumonia screening."""
-    return advanced_screening_model.calculate_advanced_pneumonia_score(responses, age_days)
+    return _get_model().calculate_advanced_pneumonia_score(responses, age_days)
+
+def run_advanced_pneumonia_screening_batch(batch: List[List[str]], ages: Optional[List[Optional[float]]] = None) -> List[Dict]:
+    """Run advanced pneumonia screening over many response sets at once."""
+    return _get_model().calculate_pneumonia_scores_batch(batch, ages)
 
 # Test the advanced screening model
 if __name__ == "__main__":
@@ -1,4 +1,8 @@
 # Parenting Assistant for Non-Clinical Issues
+import functools
+import operator
+from collections import Counter
+
 class ConsultAdviceGPT:
     def __init__(self):
         self.expert_mapping = {
@@ -90,28 +94,87 @@ class ConsultAdviceGPT:
                 ]
             }
         }
+
+        # Fallback guidance for topics without a specific template
+        self._general_guidance = {
+            "gentle_advice": [
+                "It's completely normal to have questions and concerns about your baby's development.",
+                "Every baby is unique and may have different needs and patterns.",
+                "Trust your instincts as a parent - you know your baby best.",
+                "Many parenting challenges are temporary and resolve with time.",
+                "It's okay to seek support and guidance when you need it."
+            ],
+            "behavioral_tips": [
+                "Maintain consistent routines and schedules.",
+                "Provide plenty of love, attention, and positive interaction.",
+                "Create a safe, nurturing environment for your baby.",
+                "Take care of yourself so you can be the best parent possible.",
+                "Don't hesitate to reach out for professional support when needed."
+            ]
+        }
+
+        # generate_response only ever uses the expert string, the first two
+        # advice/tip entries and the consultation offer, so precompute those
+        # per topic once instead of rebuilding the full guidance dict per
+        # call. Tuples keep the shared entries immutable
+        self._prebuilt = {}
+        for topic, data in self.expert_mapping.items():
+            templates = self.guidance_templates.get(topic, self._general_guidance)
+            self._prebuilt[topic] = {
+                "expert": data["expert"],
+                "gentle_advice": tuple(templates["gentle_advice"][:2]),
+                "behavioral_tips": tuple(templates["behavioral_tips"][:2]),
+                "consultation_offer": f"Would you like to consult a {data['expert']}? We can help you book an appointment."
+            }
+        self._general_prebuilt = self._prebuilt["general"]
+
+        # The full response only depends on the topic, so build the complete
+        # payload per topic as well; generate_response copies the two dict
+        # levels instead of re-creating every key and f-string per call
+        self._responses = {
+            topic: {
+                "topic_identified": topic,
+                "expert_type": prebuilt["expert"],
+                "response": {
+                    "acknowledgment": f"I understand you're concerned about your baby's {topic}. This is a common parenting challenge.",
+                    "gentle_advice": prebuilt["gentle_advice"],
+                    "behavioral_tips": prebuilt["behavioral_tips"],
+                    "consultation_offer": prebuilt["consultation_offer"],
+                    "disclaimer": "This guidance is for general parenting support and should not replace professional medical advice."
+                }
+            }
+            for topic, prebuilt in self._prebuilt.items()
+        }
+
+        # Keyword -> topics that list it (some keywords, like 'milestones'
+        # and 'development', belong to several topics). identify_topic then
+        # walks the keyword table once instead of nested per-topic loops
+        keyword_topics = {}
+        for topic, data in self.expert_mapping.items():
+            for keyword in data["keywords"]:
+                keyword_topics.setdefault(keyword, []).append(topic)
+        self._keyword_topics = {
+            keyword: tuple(topics) for keyword, topics in keyword_topics.items()
+        }
     
     def identify_topic(self, user_input):
         """Identify the main topic of the user's concern."""
         input_lower = user_input.lower()
         
-        # Count keyword matches for each topic
-        topic_scores = {}
-        for topic, data in self.expert_mapping.items():
-            score = 0
-            for keyword in data["keywords"]:
-                if keyword in input_lower:
-                    score += 1
-            topic_scores[topic] = score
+        # Count keyword matches for each topic. Matching stays substring-
+        # based ('sleep' matches inside 'sleeping'); the scores are laid out
+        # in expert_mapping order so tie-breaking is unchanged
+        counts = Counter()
+        for keyword, topics in self._keyword_topics.items():
+            if keyword in input_lower:
+                counts.update(topics)
+        topic_scores = {topic: counts[topic] for topic in self.expert_mapping}
         
-        # Return the topic with the highest score, or "general" if no clear match
-        max_score = max(topic_scores.values())
-        if max_score > 0:
-            for topic, score in topic_scores.items():
-                if score == max_score:
-                    return topic
-        else:
-            return "general"
+        # Return the topic with the highest score, or "general" if no clear
+        # match. max over items keeps the old tie-breaking (first topic in
+        # expert_mapping order wins) without a second pass
+        top_topic, top_score = max(topic_scores.items(), key=operator.itemgetter(1))
+        return top_topic if top_score > 0 else "general"
     
     def get_guidance(self, topic, user_input):
         """Generate gentle, behavioral guidance for the identified topic."""
@@ -124,54 +187,40 @@ class ConsultAdviceGPT:
         }
         
         # Add topic-specific guidance if available
-        if topic in self.guidance_templates:
-            guidance["gentle_advice"] = self.guidance_templates[topic]["gentle_advice"]
-            guidance["behavioral_tips"] = self.guidance_templates[topic]["behavioral_tips"]
-        else:
-            # General guidance for topics not specifically covered
-            guidance["gentle_advice"] = [
-                "It's completely normal to have questions and concerns about your baby's development.",
-                "Every baby is unique and may have different needs and patterns.",
-                "Trust your instincts as a parent - you know your baby best.",
-                "Many parenting challenges are temporary and resolve with time.",
-                "It's okay to seek support and guidance when you need it."
-            ]
-            guidance["behavioral_tips"] = [
-                "Maintain consistent routines and schedules.",
-                "Provide plenty of love, attention, and positive interaction.",
-                "Create a safe, nurturing environment for your baby.",
-                "Take care of yourself so you can be the best parent possible.",
-                "Don't hesitate to reach out for professional support when needed."
-            ]
+        templates = self.guidance_templates.get(topic, self._general_guidance)
+        guidance["gentle_advice"] = templates["gentle_advice"]
+        guidance["behavioral_tips"] = templates["behavioral_tips"]
         
         return guidance
     
     def generate_response(self, user_input):
         """Generate a complete response with guidance and consultation offer."""
         topic = self.identify_topic(user_input)
-        guidance = self.get_guidance(topic, user_input)
-        
-        # Construct the response
-        response = {
-            "topic_identified": topic,
-            "expert_type": guidance["expert"],
-            "response": {
-                "acknowledgment": f"I understand you're concerned about your baby's {topic}. This is a common parenting challenge.",
-                "gentle_advice": guidance["gentle_advice"][:2],  # Limit to 2 pieces of advice
-                "behavioral_tips": guidance["behavioral_tips"][:2],  # Limit to 2 tips
-                "consultation_offer": guidance["consultation_offer"],
-                "disclaimer": "This guidance is for general parenting support and should not replace professional medical advice."
-            }
-        }
+        template = self._responses.get(topic, self._responses["general"])
         
+        # Copy both dict levels so callers can't mutate the template
+        response = dict(template)
+        response["response"] = dict(template["response"])
         return response
 
 # Global instance
 consult_advice_gpt = ConsultAdviceGPT()
 
+@functools.lru_cache(maxsize=4096)
+def _advice_cached(normalized_input):
+    return consult_advice_gpt.generate_response(normalized_input)
+
 def get_consult_advice(user_input):
-    """Main function to get parenting advice for non-clinical issues."""
-    return consult_advice_gpt.generate_response(user_input)
+    """Main function to get parenting advice for non-clinical issues.
+
+    Responses only depend on the identified topic, so they are memoized on
+    the stripped, lowercased input; the two dict levels are copied so
+    callers can't mutate the cached entry.
+    """
+    cached = _advice_cached(user_input.strip().lower())
+    result = dict(cached)
+    result["response"] = dict(cached["response"])
+    return result
 
 # Test the function
 if __name__ == "__main__":
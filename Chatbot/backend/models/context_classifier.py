@@ -1,4 +1,43 @@
 # Context Classifier for User Input Analysis
+import functools
+import re
+
+try:
+    import ahocorasick
+except ImportError:
+    # Optional accelerator; without it the scan falls back to per-keyword
+    # substring checks with identical results
+    ahocorasick = None
+
+# Classifications whose content never varies, built once; analyze_input
+# returns copies so downstream mutation (get_classification_with_context
+# adds keys) can't corrupt the constants
+_EMERGENCY_RESULT = {
+    "classified_context": "medical_non_screenable",
+    "reasoning": "Contains emergency indicators requiring immediate medical attention",
+    "confidence": "high"
+}
+_FOLLOW_UP_RESULT = {
+    "classified_context": "follow_up",
+    "reasoning": "Detected follow-up intent",
+    "confidence": "high"
+}
+_CONSULT_RESULT = {
+    "classified_context": "consult",
+    "reasoning": "Detected consult/advice intent",
+    "confidence": "high"
+}
+_QUESTION_CONSULT_RESULT = {
+    "classified_context": "consult",
+    "reasoning": "Message is a question and not a clear screenable symptom",
+    "confidence": "medium"
+}
+_DEFAULT_RESULT = {
+    "classified_context": "medical_screenable",
+    "reasoning": "Unclear symptoms - defaulting to medical screening for safety",
+    "confidence": "low"
+}
+
 class ContextClassifier:
     def __init__(self):
         # Medical conditions that can be screened using our system
@@ -59,81 +98,173 @@ class ContextClassifier:
             "seizure", "convulsion", "bleeding", "broken", "fracture", "burn", "poison",
             "overdose", "accident", "injury", "trauma", "head injury", "fall"
         ]
-    
-    def analyze_input(self, user_input):
-        """Analyze user input and classify the context."""
-        input_lower = user_input.lower()
-        
-        # Check for emergency indicators first
-        if any(indicator in input_lower for indicator in self.emergency_indicators):
-            return {
-                "classified_context": "medical_non_screenable",
-                "reasoning": "Contains emergency indicators requiring immediate medical attention",
-                "confidence": "high"
-            }
-        
-        # Check for screenable medical conditions
-        screenable_matches = []
-        for condition, keywords in self.screenable_conditions.items():
-            for keyword in keywords:
-                if keyword in input_lower:
-                    screenable_matches.append(condition)
-                    break  # Found one keyword for this condition
-        
-        # Check for non-screenable medical conditions
-        non_screenable_matches = []
-        for keyword in self.non_screenable_medical:
-            if keyword in input_lower:
-                non_screenable_matches.append(keyword)
-        
-        # Check for non-medical concerns
-        non_medical_matches = []
-        for keyword in self.non_medical_concerns:
-            if keyword in input_lower:
-                non_medical_matches.append(keyword)
-        
-        # Check for follow-up keywords
-        follow_up_keywords = [
+
+        # Follow-up intent keywords
+        self.follow_up_keywords = [
             "follow up", "checkup", "come back", "not improved", "still sick", "after treatment",
             "antibiotics", "medicine", "treatment", "persistent", "not better", "not resolved",
             "not gone", "keeps happening", "did not improve", "symptoms remain", "after medication",
             "after antibiotics", "not responding", "not working", "not effective"
         ]
-        if any(kw in input_lower for kw in follow_up_keywords):
-            return {
-                "classified_context": "follow_up",
-                "reasoning": "Detected follow-up intent",
-                "confidence": "high"
-            }
-        
-        # Check for consult/advice keywords (expanded)
-        consult_keywords = [
+
+        # Consult/advice intent keywords
+        self.consult_keywords = [
             "should i", "is it safe", "can i give", "what should i do", "advice", "consult",
             "is it ok", "is it okay", "can my child", "can i use", "how can i", "what can i do",
             "tips for", "prevent", "manage", "care for", "when should i", "is it normal",
             "is it necessary", "is it recommended", "is it possible", "is it allowed", "is it harmful",
             "is it beneficial", "is it required", "is it important", "is it urgent", "is it dangerous"
         ]
-        if any(kw in input_lower for kw in consult_keywords):
-            return {
-                "classified_context": "consult",
-                "reasoning": "Detected consult/advice intent",
-                "confidence": "high"
-            }
+
+        self.question_starts = ("how ", "what ", "when ", "should ", "is ", "can ", "could ", "would ", "do ", "does ", "did ")
+        # Anchored alternation equivalent to strip().startswith(question_starts)
+        # without allocating the stripped copy; the trailing [\s\S]*?\S
+        # demands something after the question word, as strip() would have
+        # removed a purely-whitespace tail
+        self._question_re = re.compile(
+            r"\s*(?:" + "|".join(re.escape(q.strip()) for q in self.question_starts) + r") [\s\S]*?\S"
+        )
+
+        # Every keyword across all buckets, deduplicated. Keywords are kept
+        # verbatim: they were always substring-matched as-is against the
+        # lowercased input, so 'ER' (uppercase) never matches and must stay
+        # uppercase to avoid suddenly matching words like 'fever'
+        self._all_keywords = tuple(dict.fromkeys(
+            keyword
+            for bucket in (
+                *self.screenable_conditions.values(),
+                self.non_screenable_medical,
+                self.non_medical_concerns,
+                self.emergency_indicators,
+                self.follow_up_keywords,
+                self.consult_keywords
+            )
+            for keyword in bucket
+        ))
+
+        # One Aho-Corasick automaton over all keywords: analyze_input scans
+        # the input a single time and gets back every keyword it contains,
+        # instead of one substring pass per keyword per bucket. The whole
+        # scan runs inside the C extension, so there is no interpreter
+        # dispatch left in the inner loop to JIT-compile away
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self._all_keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            self._automaton = None
+
+        # Fallback scanner: one compiled alternation, longest keyword first.
+        # The lookahead keeps the match zero-width so overlapping keywords
+        # ('thin' inside 'breathing') are still found at their own offsets
+        by_length = sorted(self._all_keywords, key=len, reverse=True)
+        self._keyword_re = re.compile(
+            r"(?=(" + "|".join(re.escape(keyword) for keyword in by_length) + r"))"
+        )
+        # At a given offset the alternation only reports the longest keyword,
+        # so keywords that are proper prefixes of another ('blood' in
+        # 'bloodstream infection') must be re-added after the scan
+        self._prefixes_of = {}
+        for keyword in self._all_keywords:
+            shorter = tuple(
+                other for other in self._all_keywords
+                if other != keyword and keyword.startswith(other)
+            )
+            if shorter:
+                self._prefixes_of[keyword] = shorter
+
+        # Freeze the buckets: the existence-only ones become frozensets so
+        # analyze_input can probe them with set intersection; the two whose
+        # match order feeds the reasoning strings stay ordered tuples
+        self.screenable_conditions = {
+            condition: frozenset(keywords)
+            for condition, keywords in self.screenable_conditions.items()
+        }
+        self.emergency_indicators = frozenset(self.emergency_indicators)
+        self.follow_up_keywords = frozenset(self.follow_up_keywords)
+        self.consult_keywords = frozenset(self.consult_keywords)
+        self.non_screenable_medical = tuple(self.non_screenable_medical)
+        self.non_medical_concerns = tuple(self.non_medical_concerns)
+
+        # Bucket membership as one bitmask per keyword: bits 0..n-1 are the
+        # screenable conditions in definition order, then non-screenable,
+        # non-medical, emergency, follow-up and consult. analyze_input ORs
+        # the masks of the matched keywords, so a keyword shared between
+        # buckets ('development' is both a screenable keyword and a
+        # parenting concern) is attributed to all of them in one lookup
+        self._condition_names = tuple(self.screenable_conditions)
+        masks = {}
+        def _tag(keywords, bit):
+            for keyword in keywords:
+                masks[keyword] = masks.get(keyword, 0) | bit
+        for index, keywords in enumerate(self.screenable_conditions.values()):
+            _tag(keywords, 1 << index)
+        n = len(self._condition_names)
+        self._screenable_mask = (1 << n) - 1
+        self._non_screenable_bit = 1 << n
+        self._non_medical_bit = 1 << (n + 1)
+        self._emergency_bit = 1 << (n + 2)
+        self._follow_up_bit = 1 << (n + 3)
+        self._consult_bit = 1 << (n + 4)
+        _tag(self.non_screenable_medical, self._non_screenable_bit)
+        _tag(self.non_medical_concerns, self._non_medical_bit)
+        _tag(self.emergency_indicators, self._emergency_bit)
+        _tag(self.follow_up_keywords, self._follow_up_bit)
+        _tag(self.consult_keywords, self._consult_bit)
+        self._kw_bucket_mask = masks
+
+    def _scan(self, input_lower):
+        """Return the set of known keywords contained in the input."""
+        if self._automaton is not None:
+            return {keyword for _, keyword in self._automaton.iter(input_lower)}
+        matched = {m.group(1) for m in self._keyword_re.finditer(input_lower)}
+        for keyword in matched & self._prefixes_of.keys():
+            matched.update(self._prefixes_of[keyword])
+        return matched
+    
+    def analyze_input(self, user_input):
+        """Analyze user input and classify the context."""
+        input_lower = user_input.lower()
+
+        # One scan collects every keyword present; the priority logic below
+        # then only probes the result set
+        matched = self._scan(input_lower)
+
+        # Fold every matched keyword's bucket bits into one integer; the
+        # priority chain below is then pure mask tests. Priority is
+        # unchanged: emergency, follow-up, consult, question (unless
+        # screenable), screenable, non-screenable, non-medical
+        bucket_mask = self._kw_bucket_mask.get
+        hit_mask = 0
+        for keyword in matched:
+            hit_mask |= bucket_mask(keyword, 0)
+        
+        if hit_mask & self._emergency_bit:
+            return dict(_EMERGENCY_RESULT)
+        
+        # Check for follow-up keywords
+        if hit_mask & self._follow_up_bit:
+            return dict(_FOLLOW_UP_RESULT)
+        
+        # Check for consult/advice keywords (expanded)
+        if hit_mask & self._consult_bit:
+            return dict(_CONSULT_RESULT)
+        
+        screenable_bits = hit_mask & self._screenable_mask
         
         # Prefer consult if message is a question and not a clear screenable symptom
-        question_starts = ("how ", "what ", "when ", "should ", "is ", "can ", "could ", "would ", "do ", "does ", "did ")
-        if user_input.strip().lower().startswith(question_starts):
-            if not screenable_matches:
-                return {
-                    "classified_context": "consult",
-                    "reasoning": "Message is a question and not a clear screenable symptom",
-                    "confidence": "medium"
-                }
+        if not screenable_bits and self._question_re.match(input_lower):
+            return dict(_QUESTION_CONSULT_RESULT)
         
         # Determine classification based on matches
-        if screenable_matches:
+        if screenable_bits:
             # If screenable conditions are mentioned, prioritize medical screening
+            screenable_matches = [
+                condition
+                for index, condition in enumerate(self._condition_names)
+                if screenable_bits >> index & 1
+            ]
             condition_names = [condition.replace("_", " ") for condition in screenable_matches]
             reasoning = f"Mentions {', '.join(condition_names)} which can be screened using our system"
             return {
@@ -143,7 +274,11 @@ class ContextClassifier:
                 "detected_conditions": screenable_matches
             }
         
-        elif non_screenable_matches:
+        # Check for non-screenable medical conditions
+        if hit_mask & self._non_screenable_bit:
+            non_screenable_matches = [
+                keyword for keyword in self.non_screenable_medical if keyword in matched
+            ]
             # Medical conditions outside our screening scope
             reasoning = f"Medical concerns ({', '.join(non_screenable_matches[:3])}) outside our screening scope"
             return {
@@ -153,7 +288,11 @@ class ContextClassifier:
                 "detected_conditions": non_screenable_matches
             }
         
-        elif non_medical_matches:
+        # Check for non-medical concerns
+        if hit_mask & self._non_medical_bit:
+            non_medical_matches = [
+                keyword for keyword in self.non_medical_concerns if keyword in matched
+            ]
             # Non-medical parenting concerns
             reasoning = f"Non-medical parenting concerns ({', '.join(non_medical_matches[:3])})"
             return {
@@ -163,13 +302,8 @@ class ContextClassifier:
                 "detected_concerns": non_medical_matches
             }
         
-        else:
-            # Ambiguous or unclear input
-            return {
-                "classified_context": "medical_screenable",  # Default to screening for safety
-                "reasoning": "Unclear symptoms - defaulting to medical screening for safety",
-                "confidence": "low"
-            }
+        # Ambiguous or unclear input; default to screening for safety
+        return dict(_DEFAULT_RESULT)
     
     def get_classification_with_context(self, user_input):
         """Get detailed classification with additional context information."""
@@ -193,9 +327,18 @@ class ContextClassifier:
 # Global instance
 context_classifier = ContextClassifier()
 
+@functools.lru_cache(maxsize=4096)
+def _classify_cached(normalized_input):
+    return context_classifier.get_classification_with_context(normalized_input)
+
 def classify_context(user_input):
-    """Main function to classify user input context."""
-    return context_classifier.get_classification_with_context(user_input)
+    """Main function to classify user input context.
+
+    Results are memoized on the stripped, lowercased input since chatbot
+    traffic repeats heavily; callers get a copy so the cached dict can't
+    be mutated.
+    """
+    return dict(_classify_cached(user_input.strip().lower()))
 
 # Test the classifier
 if __name__ == "__main__":
@@ -4,14 +4,13 @@ Handles communication with different Gemini services
 """
 
 import os
-import json
 import time
 import logging
 import asyncio
 import google.generativeai as genai
+import orjson
 from typing import Dict, Any, Optional, List, Union
 from enum import Enum
-from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -98,7 +97,7 @@ class GeminiBaseClient:
                     }
             except Exception as e:
                 last_error = e
-                logger.warning(f"Gemini API call failed (attempt {retries+1}/{MAX_RETRIES}): {e}")
+                logger.warning("Gemini API call failed (attempt %d/%d): %s", retries + 1, MAX_RETRIES, e)
                 retries += 1
                 if retries < MAX_RETRIES:
                     time.sleep(RETRY_DELAY * retries)  # Exponential backoff
@@ -109,13 +108,78 @@ class GeminiBaseClient:
             return self._handle_error(Exception("Unknown Gemini error"))
     
     async def call_async(self, prompt: str, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, Any]:
-        """Asynchronous call to Gemini"""
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            return await loop.run_in_executor(
-                executor, 
-                lambda: self.call_with_retry(prompt, timeout)
-            )
+        """Asynchronous call to Gemini (sync API moved off the event loop)"""
+        return await asyncio.to_thread(self.call_with_retry, prompt, timeout)
+
+    async def call_with_retry_async(self, prompt: str, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+        """Call Gemini with retry logic via the SDK's native async API"""
+        retries = 0
+        last_error = None
+        
+        while retries < MAX_RETRIES:
+            try:
+                response = await self.model.generate_content_async(prompt)
+                
+                if self._validate_response(response):
+                    return {
+                        "success": True,
+                        "content": response.text,
+                        "model": self.model_name,
+                        "timestamp": time.time()
+                    }
+                else:
+                    return {
+                        "error": True,
+                        "error_type": GeminiErrorType.INVALID_RESPONSE.value,
+                        "error_message": "Invalid response format from Gemini",
+                        "timestamp": time.time()
+                    }
+            except Exception as e:
+                last_error = e
+                logger.warning("Gemini API call failed (attempt %d/%d): %s", retries + 1, MAX_RETRIES, e)
+                retries += 1
+                if retries < MAX_RETRIES:
+                    await asyncio.sleep(RETRY_DELAY * retries)  # Exponential backoff
+        
+        if last_error is not None:
+            return self._handle_error(last_error)
+        else:
+            return self._handle_error(Exception("Unknown Gemini error"))
+
+    def _parse_json_result(self, response: Dict[str, Any], result_key: str) -> Dict[str, Any]:
+        """Extract the first JSON object from a successful response"""
+        if not response.get("success"):
+            return response
+        
+        content = response["content"]
+        try:
+            json_start = content.find('{')
+            json_end = content.rfind('}') + 1
+            if json_start >= 0 and json_end > json_start:
+                json_str = content[json_start:json_end]
+                result = orjson.loads(json_str)
+                return {
+                    "success": True,
+                    result_key: result,
+                    "model": self.model_name,
+                    "timestamp": time.time()
+                }
+            else:
+                return {
+                    "error": True,
+                    "error_type": GeminiErrorType.INVALID_RESPONSE.value,
+                    "error_message": "Could not extract JSON from response",
+                    "raw_response": content,
+                    "timestamp": time.time()
+                }
+        except orjson.JSONDecodeError:
+            return {
+                "error": True,
+                "error_type": GeminiErrorType.INVALID_RESPONSE.value,
+                "error_message": "Invalid JSON in response",
+                "raw_response": content,
+                "timestamp": time.time()
+            }
 
 
 class ContextClassifierClient(GeminiBaseClient):
@@ -150,7 +214,7 @@ class ContextClassifierClient(GeminiBaseClient):
                 json_end = content.rfind('}') + 1
                 if json_start >= 0 and json_end > json_start:
                     json_str = content[json_start:json_end]
-                    result = json.loads(json_str)
+                    result = orjson.loads(json_str)
                     return {
                         "success": True,
                         "classification": result,
@@ -165,7 +229,7 @@ class ContextClassifierClient(GeminiBaseClient):
                         "raw_response": content,
                         "timestamp": time.time()
                     }
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 return {
                     "error": True,
                     "error_type": GeminiErrorType.INVALID_RESPONSE.value,
@@ -176,6 +240,12 @@ class ContextClassifierClient(GeminiBaseClient):
         
         return response
 
+    async def classify_async(self, user_input: str) -> Dict[str, Any]:
+        """Async variant of classify"""
+        prompt = f"{self.SYSTEM_PROMPT}\n\nUser message: {user_input}"
+        response = await self.call_with_retry_async(prompt)
+        return self._parse_json_result(response, "classification")
+
 
 class TriageClient(GeminiBaseClient):
     """Client for triage service"""
@@ -210,7 +280,7 @@ class TriageClient(GeminiBaseClient):
                 json_end = content.rfind('}') + 1
                 if json_start >= 0 and json_end > json_start:
                     json_str = content[json_start:json_end]
-                    result = json.loads(json_str)
+                    result = orjson.loads(json_str)
                     return {
                         "success": True,
                         "triage_result": result,
@@ -225,7 +295,7 @@ class TriageClient(GeminiBaseClient):
                         "raw_response": content,
                         "timestamp": time.time()
                     }
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 return {
                     "error": True,
                     "error_type": GeminiErrorType.INVALID_RESPONSE.value,
@@ -236,6 +306,12 @@ class TriageClient(GeminiBaseClient):
         
         return response
 
+    async def triage_async(self, user_input: str) -> Dict[str, Any]:
+        """Async variant of triage"""
+        prompt = f"{self.SYSTEM_PROMPT}\n\nParent's description: {user_input}"
+        response = await self.call_with_retry_async(prompt)
+        return self._parse_json_result(response, "triage_result")
+
 
 class RedFlagClient(GeminiBaseClient):
     """Client for red flag detection service"""
@@ -273,7 +349,7 @@ Return:
                 json_end = content.rfind('}') + 1
                 if json_start >= 0 and json_end > json_start:
                     json_str = content[json_start:json_end]
-                    result = json.loads(json_str)
+                    result = orjson.loads(json_str)
                     return {
                         "success": True,
                         "red_flag_result": result,
@@ -288,7 +364,7 @@ Return:
                         "raw_response": content,
                         "timestamp": time.time()
                     }
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 return {
                     "error": True,
                     "error_type": GeminiErrorType.INVALID_RESPONSE.value,
@@ -299,6 +375,12 @@ Return:
         
         return response
 
+    async def detect_red_flags_async(self, user_input: str) -> Dict[str, Any]:
+        """Async variant of detect_red_flags"""
+        prompt = f"{self.SYSTEM_PROMPT}\n\nParent's message: {user_input}"
+        response = await self.call_with_retry_async(prompt)
+        return self._parse_json_result(response, "red_flag_result")
+
 
 class ScreeningClient(GeminiBaseClient):
     """Client for detailed screening service"""
@@ -337,7 +419,7 @@ class ScreeningClient(GeminiBaseClient):
                 json_end = content.rfind('}') + 1
                 if json_start >= 0 and json_end > json_start:
                     json_str = content[json_start:json_end]
-                    result = json.loads(json_str)
+                    result = orjson.loads(json_str)
                     return {
                         "success": True,
                         "screening_result": result,
@@ -352,7 +434,7 @@ class ScreeningClient(GeminiBaseClient):
                         "raw_response": content,
                         "timestamp": time.time()
                     }
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 return {
                     "error": True,
                     "error_type": GeminiErrorType.INVALID_RESPONSE.value,
@@ -363,6 +445,13 @@ class ScreeningClient(GeminiBaseClient):
         
         return response
 
+    async def screen_condition_async(self, condition: str, symptoms: List[str]) -> Dict[str, Any]:
+        """Async variant of screen_condition"""
+        symptoms_text = "\n".join([f"- {symptom}" for symptom in symptoms])
+        prompt = f"{self.SYSTEM_PROMPT}\n\nCondition: {condition}\n\nSymptoms:\n{symptoms_text}"
+        response = await self.call_with_retry_async(prompt)
+        return self._parse_json_result(response, "screening_result")
+
 
 class AdviceClient(GeminiBaseClient):
     """Client for medical advice service"""
@@ -397,7 +486,7 @@ class AdviceClient(GeminiBaseClient):
                 json_end = content.rfind('}') + 1
                 if json_start >= 0 and json_end > json_start:
                     json_str = content[json_start:json_end]
-                    result = json.loads(json_str)
+                    result = orjson.loads(json_str)
                     return {
                         "success": True,
                         "advice_result": result,
@@ -412,7 +501,7 @@ class AdviceClient(GeminiBaseClient):
                         "raw_response": content,
                         "timestamp": time.time()
                     }
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 return {
                     "error": True,
                     "error_type": GeminiErrorType.INVALID_RESPONSE.value,
@@ -421,4 +510,10 @@ class AdviceClient(GeminiBaseClient):
                     "timestamp": time.time()
                 }
         
-        return response 
\ No newline at end of file
+        return response
+
+    async def get_advice_async(self, condition: str, user_input: str) -> Dict[str, Any]:
+        """Async variant of get_advice"""
+        prompt = f"{self.SYSTEM_PROMPT}\n\nCondition: {condition}\n\nParent's concern: {user_input}"
+        response = await self.call_with_retry_async(prompt)
+        return self._parse_json_result(response, "advice_result")
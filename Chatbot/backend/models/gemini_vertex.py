@@ -1,22 +1,29 @@
 from vertexai.generative_models import GenerativeModel
 import vertexai
 import google.auth
+import functools
 
 PROJECT_ID = "pkr-prod-in-core"
 LOCATION = "us-central1"
+MODEL_NAME = "gemini-1.5-pro-001"
 
-vertexai.init(
-    project=PROJECT_ID,
-    location=LOCATION,
-    credentials=google.auth.default(
+@functools.lru_cache(maxsize=None)
+def get_model(project: str = PROJECT_ID, location: str = LOCATION, model_name: str = MODEL_NAME) -> GenerativeModel:
+    """Lazily initialize Vertex AI and build the model exactly once.
+
+    Importing this module no longer pays credential discovery and gRPC
+    channel setup; the first caller does, and every later call (or import)
+    reuses the same cached model. In multi-process deploys call this after
+    fork so the gRPC channel is per-worker.
+    """
+    credentials = google.auth.default(
         scopes=[
             "https://www.googleapis.com/auth/cloud-platform",
             "https://www.googleapis.com/auth/aiplatform"
         ]
     )[0]
-)
-
-model = GenerativeModel("gemini-1.5-pro-001")
+    vertexai.init(project=project, location=location, credentials=credentials)
+    return GenerativeModel(model_name)
 
 # Initial system prompt manually added to history
 TRIAGE_CONTEXT = """
@@ -43,7 +50,7 @@ def triage_with_gemini(user_input: str) -> str:
     """Call Gemini 2.0 Flash model for nuanced, context-aware triage response."""
     try:
         prompt = f"{TRIAGE_CONTEXT}\n\nParent's description: {user_input}"
-        response = model.generate_content(prompt)
+        response = get_model().generate_content(prompt)
         return response.text
     except Exception as e:
         return f"{{'error': 'Failed to get response from Gemini model', 'details': '{str(e)}'}}"
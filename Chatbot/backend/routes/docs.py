@@ -0,0 +1,249 @@
+"""
+API documentation routes for Pukaar-GPT
+Serves API_DOCUMENTATION.md rendered to HTML, caching the finished page
+"""
+
+import functools
+import gzip
+import hashlib
+import itertools
+import os
+import threading
+import time
+
+import markdown
+from markdown.extensions.codehilite import CodeHiliteExtension
+from markdown.extensions.fenced_code import FencedCodeExtension
+from markdown.extensions.tables import TableExtension
+from flask import Blueprint, Response, redirect, render_template, request, send_file, url_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# codehilite resolves a Pygments lexer per fenced block, which walks the
+# plugin registry on first lookup. Resolve the lexers the docs actually use
+# (and the formatter) once at import so cache-miss renders skip that cost
+try:
+    from pygments.formatters import HtmlFormatter
+    from pygments.lexers import get_lexer_by_name
+    _PYGMENTS_FORMATTER = HtmlFormatter(cssclass='codehilite')
+    _PYGMENTS_LEXERS = {
+        name: get_lexer_by_name(name)
+        for name in ('python', 'bash', 'json', 'http', 'yaml')
+    }
+except ImportError:
+    _PYGMENTS_FORMATTER = None
+    _PYGMENTS_LEXERS = {}
+
+docs_bp = Blueprint("docs", __name__)
+
+# The server never chdirs, so the working directory can be cached at import
+_CWD = os.getcwd()
+
+def _debug_listing():
+    """List the working directory for error pages (capped to bound memory)"""
+    try:
+        return [entry.name for entry in itertools.islice(os.scandir('.'), 50)]
+    except OSError:
+        return []
+
+# Possible locations of the markdown documentation file
+API_DOC_PATHS = [
+    os.path.join(os.path.dirname(__file__), '..', '..', 'API_DOCUMENTATION.md'),  # Relative to backend folder
+    os.path.join(_CWD, 'API_DOCUMENTATION.md'),  # Current working directory
+    '/app/API_DOCUMENTATION.md',  # Docker container path
+    'API_DOCUMENTATION.md'  # Direct path
+]
+
+# Cache for the rendered API documentation, keyed by file mtime so the
+# markdown is only re-read and re-rendered when the file actually changes.
+# The fully rendered page is kept as bytes together with its ETag so hot
+# requests skip Jinja entirely and repeat viewers can get a 304. Compressed
+# variants are produced once at fill time and picked per Accept-Encoding
+_API_DOC_CACHE = {'path': None, 'mtime': None, 'body': None, 'etag': None, 'gzip': None, 'br': None}
+
+# Build the markdown converter once instead of rebuilding the extension
+# pipeline on every call. Extension instances are passed directly so no
+# string-based importlib resolution happens per construction, and
+# guess_lang=False keeps codehilite from running Pygments' O(n-lexers)
+# guess_lexer on unlabelled code blocks. Markdown instances are not
+# thread-safe, so conversions (at most one per file change) take a lock
+_MD_EXTENSIONS = [
+    FencedCodeExtension(),
+    TableExtension(),
+    CodeHiliteExtension(guess_lang=False, use_pygments=True)
+]
+_MD = markdown.Markdown(extensions=_MD_EXTENSIONS, output_format='html5')
+_MD_LOCK = threading.Lock()
+
+@functools.lru_cache(maxsize=16)
+def _render(md_bytes):
+    """Render markdown bytes to the finished page, keyed by content.
+
+    Keying on the bytes themselves (the doc is small) means mtime bumps
+    without a content change - touch, CI container rebuilds - reuse the
+    previous rendering instead of re-running markdown and Pygments.
+    """
+    with _MD_LOCK:
+        html_content = _MD.reset().convert(md_bytes.decode('utf-8'))
+    return render_template('api_doc_template.html', content=html_content).encode('utf-8')
+
+def _resolve_doc_path():
+    """Resolve the documentation path once; None is cached as "not found"."""
+    for path in API_DOC_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+# Resolve the path once at startup so request handling does no path probing
+_DOC_PATH = _resolve_doc_path()
+
+def _ensure_doc_cache():
+    """Fill the render cache if the documentation file changed since last fill"""
+    doc_path = _DOC_PATH
+    if doc_path is None:
+        return None
+
+    mtime = os.stat(doc_path).st_mtime
+    if _API_DOC_CACHE['path'] != doc_path or _API_DOC_CACHE['mtime'] != mtime:
+        with open(doc_path, 'rb') as file:
+            md_bytes = file.read()
+
+        # Render (or reuse the content-keyed rendering) and cache the
+        # finished page as bytes with a digest for conditional requests
+        body = _render(md_bytes)
+        etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        _API_DOC_CACHE.update({
+            'path': doc_path,
+            'mtime': mtime,
+            'body': body,
+            'etag': etag,
+            'gzip': gzip.compress(body, compresslevel=6),
+            'br': brotli.compress(body, quality=5) if brotli else None
+        })
+
+    return _API_DOC_CACHE
+
+# Background watcher: refresh the cache off the request path so no request
+# ever pays the render cost after a file change
+_WATCH_INTERVAL = 2.0  # seconds
+_watcher_started = False
+
+def _watch_doc_file(app):
+    """Poll the doc file's mtime and refill the cache when it changes"""
+    while True:
+        time.sleep(_WATCH_INTERVAL)
+        try:
+            with app.app_context():
+                _ensure_doc_cache()
+        except Exception as e:
+            app.logger.warning(f"API doc watcher refresh failed: {e}")
+
+def warm_doc_cache(app):
+    """Render the documentation during app boot so the first request is hot"""
+    global _watcher_started
+    try:
+        with app.app_context():
+            _ensure_doc_cache()
+    except Exception as e:
+        app.logger.warning(f"API doc cache warm-up failed: {e}")
+
+    if not _watcher_started:
+        threading.Thread(
+            target=_watch_doc_file,
+            args=(app,),
+            name='api-doc-watcher',
+            daemon=True
+        ).start()
+        _watcher_started = True
+
+# Serve API documentation from markdown file
+@docs_bp.route('/api-doc')
+def api_documentation():
+    try:
+        # Clients that ask for raw markdown (curl scripts, IDE plugins) get
+        # the file directly; conditional=True lets Werkzeug handle 304s and
+        # use the WSGI file wrapper instead of a Python-level read
+        if _DOC_PATH is not None:
+            best = request.accept_mimetypes.best_match(['text/html', 'text/markdown'])
+            if best == 'text/markdown':
+                return send_file(_DOC_PATH, mimetype='text/markdown', conditional=True)
+
+        # The watcher keeps the cache fresh; requests normally just read it,
+        # falling back to an inline fill only on a cold cache
+        cache = _API_DOC_CACHE if _API_DOC_CACHE['body'] is not None else _ensure_doc_cache()
+
+        if cache is None:
+            # If file not found, return error with all attempted paths
+            error_paths = '\n'.join([f"- {path}" for path in API_DOC_PATHS])
+            return f'''
+            <!DOCTYPE html>
+            <html>
+            <head><title>Documentation Not Found</title></head>
+            <body>
+                <h1>Documentation Not Found</h1>
+                <p>The API_DOCUMENTATION.md file was not found. Tried these paths:</p>
+                <pre>{error_paths}</pre>
+                <p>Current working directory: {_CWD}</p>
+                <p>Files in current directory: {_debug_listing()}</p>
+            </body>
+            </html>
+            ''', 404
+
+        # Fingerprinted URLs (?v=<etag>) can be cached forever by browsers
+        # and CDNs; a stale fingerprint redirects to the current one
+        version = request.args.get('v')
+        if version is not None and version != cache['etag']:
+            return redirect(url_for('docs.api_documentation', v=cache['etag']), code=302)
+
+        # Pick the smallest representation the client accepts
+        accept_encoding = request.headers.get('Accept-Encoding', '')
+        body = cache['body']
+        content_encoding = None
+        if cache['br'] is not None and 'br' in accept_encoding:
+            body = cache['br']
+            content_encoding = 'br'
+        elif 'gzip' in accept_encoding:
+            body = cache['gzip']
+            content_encoding = 'gzip'
+
+        response = Response(body, mimetype='text/html')
+        if version == cache['etag']:
+            # Content-addressed: this URL can never serve different bytes
+            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        else:
+            response.headers['Cache-Control'] = 'public, max-age=60, must-revalidate'
+            # Point caches at the immutable URL for long-lived reuse
+            response.headers['Link'] = f'<{url_for("docs.api_documentation", v=cache["etag"])}>; rel="canonical"'
+        response.headers['Vary'] = 'Accept-Encoding'
+        if content_encoding:
+            response.headers['Content-Encoding'] = content_encoding
+        response.set_etag(cache['etag'])
+        return response.make_conditional(request)
+
+    except Exception as e:
+        return f'''
+        <!DOCTYPE html>
+        <html>
+        <head><title>Error</title></head>
+        <body>
+            <h1>Error Loading Documentation</h1>
+            <p>Error: {str(e)}</p>
+            <p>Current working directory: {_CWD}</p>
+            <p>Files in current directory: {_debug_listing()}</p>
+        </body>
+        </html>
+        ''', 500
+
+@docs_bp.route('/api-doc/reload', methods=['POST'])
+def api_documentation_reload():
+    """Re-resolve the documentation path and drop the render cache"""
+    global _DOC_PATH
+    _DOC_PATH = _resolve_doc_path()
+    _API_DOC_CACHE.update({'path': None, 'mtime': None, 'body': None, 'etag': None, 'gzip': None, 'br': None})
+    return {
+        "status": "reloaded",
+        "doc_path": _DOC_PATH
+    }
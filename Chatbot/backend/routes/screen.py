@@ -74,15 +74,14 @@ def triage():
             return jsonify(response)
         
         # No red flags, proceed with triage
-        # Set flow type to triage and advance step
+        # Set flow type to triage
         SessionManager.set_flow_type(session_id, "triage")
-        current_step = SessionManager.advance_step(session_id)
         
         # Get triage result
         result = triage_with_gemini(user_input)
         
-        # Add system response to conversation history
-        SessionManager.add_message_to_history(session_id, "system", result)
+        # Record the response and advance the step in one round trip
+        current_step = SessionManager.add_message_and_advance(session_id, "system", result)
         
         # Get updated session data
         session_data = SessionManager.get_session(session_id)
@@ -299,7 +298,7 @@ def screen():
                 session_data = SessionManager.get_session(session_id) or {}
                 response["flow_type"] = session_data.get("flow_type")
                 response["current_step"] = session_data.get("current_step")
-                response["nextAction"] = ScreeningFlow.get_next_action(session_id)
+                response["nextAction"] = ScreeningFlow.get_next_action(session_id, session_data)
                 return jsonify(response)
 
         # --- Use context classifier to determine flow type before Gemini ---
@@ -348,7 +347,8 @@ def get_session(session_id):
 def get_session_history(session_id):
     """Get conversation history for a session"""
     try:
-        history = SessionManager.get_conversation_history(session_id)
+        limit = request.args.get('limit', -1, type=int)
+        history = SessionManager.get_conversation_history(session_id, limit=limit)
         if history is None:
             return jsonify({"error": "Session not found"}), 404
             
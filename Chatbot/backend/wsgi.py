@@ -0,0 +1,7 @@
+"""
+WSGI entry point for Pukaar-GPT
+Run with e.g.: gunicorn -k gthread -w 2 --threads 8 --preload wsgi:application
+(--preload shares the pre-rendered doc cache across workers via copy-on-write)
+"""
+
+from app import app as application